@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the JSON-RPC framing used between the clients and weather.py.
+
+Pushes a batch of tools/call replies (shaped like get_forecast results, with a
+few server log lines mixed in) through an OS pipe and reports messages per
+second for:
+
+    text+json       the old path: text-mode readline + json.loads / json.dumps
+    <codec>         binary buffered readline + decode_frame / encode_frame,
+                    once per installed codec (json, orjson, msgspec)
+
+Usage:
+    python bench_framing.py                  # 20000 messages
+    python bench_framing.py --messages 100000
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import threading
+import time
+
+import client
+
+def sample_reply(request_id: int) -> dict:
+    periods = [{
+        "name": f"Period {i}",
+        "startTime": "2026-10-17T06:00:00-04:00",
+        "temperatureF": 60 + i,
+        "temperatureC": 15.6 + i,
+        "precipitationChance": 10 * i,
+        "wind": "5 mph NW",
+        "shortForecast": "Partly Sunny",
+        "detailedForecast": "Partly sunny, with a high near 64. Northwest wind around 5 mph."
+    } for i in range(5)]
+    text = "\n---\n".join(f"{p['name']}:\nTemperature: {p['temperatureF']}°F\n{p['detailedForecast']}" for p in periods)
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "content": [{"type": "text", "text": text}],
+            "structuredContent": {"periods": periods},
+            "isError": False
+        }
+    }
+
+LOG_LINE = b"[10/17/26 06:00:00] INFO     Processing request of type CallToolRequest   server.py:733\n"
+
+def pump(write_fd: int, frames: list) -> threading.Thread:
+    def writer():
+        with os.fdopen(write_fd, "wb") as out:
+            for i, frame in enumerate(frames):
+                if i % 10 == 0:
+                    out.write(LOG_LINE)
+                out.write(frame)
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    return thread
+
+def run_text(messages: list) -> float:
+    start = time.perf_counter()
+    frames = [(json.dumps(m) + "\n").encode() for m in messages]
+    read_fd, write_fd = os.pipe()
+    thread = pump(write_fd, frames)
+    received = 0
+    with io.TextIOWrapper(io.FileIO(read_fd, "rb")) as stream:
+        while True:
+            line = stream.readline()
+            if not line:
+                break
+            line = line.strip()
+            if line.startswith("{"):
+                json.loads(line)
+                received += 1
+    thread.join()
+    assert received == len(messages)
+    return time.perf_counter() - start
+
+def run_binary(messages: list, codec: str) -> float:
+    _, encode, decode = client.load_json_codec(codec)
+    start = time.perf_counter()
+    frames = [encode(m) + b"\n" for m in messages]
+    read_fd, write_fd = os.pipe()
+    thread = pump(write_fd, frames)
+    received = 0
+    with os.fdopen(read_fd, "rb") as stream:
+        for line in iter(stream.readline, b""):
+            line = line.strip()
+            if line.startswith(b"{"):
+                decode(line)
+                received += 1
+    thread.join()
+    assert received == len(messages)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000, help="frames to send per run")
+    args = parser.parse_args()
+
+    messages = [sample_reply(i) for i in range(args.messages)]
+    size = len(json.dumps(messages[0]))
+    print(f"📦 {args.messages} messages of ~{size} bytes (auto codec: {client.codec_name})")
+
+    elapsed = run_text(messages)
+    print(f"{'text+json':<10} {args.messages / elapsed:10.0f} msg/s")
+    for codec in ("json", "orjson", "msgspec"):
+        if codec != "json" and importlib.util.find_spec(codec) is None:
+            print(f"{codec:<10} {'not installed':>10}")
+            continue
+        elapsed = run_binary(messages, codec)
+        print(f"{codec:<10} {args.messages / elapsed:10.0f} msg/s")
+
+if __name__ == "__main__":
+    main()
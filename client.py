@@ -1,124 +1,610 @@
 #!/usr/bin/env python3
 import asyncio
+import importlib.util
+import itertools
 import json
+import logging
 import os
 import sys
-import subprocess
-from typing import List, Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
+import httpx
+
+# asyncio's default 64 KiB line limit is too small for large tool results
+STDIO_LINE_LIMIT = 16 * 1024 * 1024
+
+# Default seconds to wait for a JSON-RPC reply before giving up on it
+DEFAULT_REQUEST_TIMEOUT = 60.0
+
+# Seconds a freshly spawned server gets to answer initialize
+STARTUP_TIMEOUT = float(os.getenv('MCP_STARTUP_TIMEOUT', '10'))
+
+# Outbound messages waiting for the stdio writer; senders wait when it is full
+OUTBOUND_QUEUE_SIZE = int(os.getenv('MCP_OUTBOUND_QUEUE_SIZE', '256'))
+
+# Server stderr is forwarded to this logger, at most STDERR_LOG_RATE lines per second
+server_logger = logging.getLogger('weather_server')
+STDERR_LOG_RATE = float(os.getenv('MCP_STDERR_LOG_RATE', '20'))
+STDERR_LOG_BURST = int(os.getenv('MCP_STDERR_LOG_BURST', '100'))
+
+# Seconds before a pool member that failed to restart is tried again (doubles per failure)
+POOL_RESTART_BACKOFF = float(os.getenv('MCP_POOL_RESTART_BACKOFF', '1'))
+POOL_RESTART_BACKOFF_MAX = float(os.getenv('MCP_POOL_RESTART_BACKOFF_MAX', '60'))
+
+# URL of a shared server started with `weather.py --transport streamable-http`.
+# When unset, every client spawns its own weather.py over stdio.
+MCP_SERVER_URL = os.getenv('MCP_SERVER_URL')
+MCP_HTTP_KEEPALIVE_CONNECTIONS = int(os.getenv('MCP_HTTP_KEEPALIVE_CONNECTIONS', '10'))
+MCP_HTTP_KEEPALIVE_EXPIRY = float(os.getenv('MCP_HTTP_KEEPALIVE_EXPIRY', '60'))
+
+# Client-side cache of tool results, so repeat questions skip the pipe and NWS
+RESULT_CACHE_ENABLED = os.getenv('MCP_RESULT_CACHE', 'true').lower() == 'true'
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv('MCP_RESULT_CACHE_MAX_ENTRIES', '256'))
+
+# Seconds a result stays fresh, per tool. Tools not listed here are not cached.
+DEFAULT_TOOL_TTLS = {
+    'get_forecast': 300.0,
+    'get_forecasts': 300.0,
+    'get_alerts': 60.0
+}
+
+# tools/list results (and schemas derived from them) kept across restarts
+TOOLS_CACHE_PATH = os.getenv(
+    'MCP_TOOLS_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mcp_tools_cache.json')
+)
+TOOLS_CACHE_ENABLED = os.getenv('MCP_TOOLS_CACHE_ENABLED', 'true').lower() == 'true'
+
+NotificationHandler = Callable[[Dict[str, Any]], Optional[Awaitable[None]]]
+
+# JSON codec for JSON-RPC frames: "auto" uses orjson or msgspec when installed, else stdlib json
+JSON_CODEC = os.getenv('MCP_JSON_CODEC', 'auto')
+
+def load_json_codec(name: str = JSON_CODEC):
+    """Return (name, encode, decode); encode gives bytes, decode takes bytes or str"""
+    if name == 'auto':
+        name = next((codec for codec in ('orjson', 'msgspec') if importlib.util.find_spec(codec)), 'json')
+    if name == 'orjson':
+        import orjson
+        return name, orjson.dumps, orjson.loads
+    if name == 'msgspec':
+        import msgspec
+        return name, msgspec.json.Encoder().encode, msgspec.json.Decoder().decode
+    if name == 'json':
+        return name, lambda message: json.dumps(message, separators=(',', ':')).encode(), json.loads
+    raise ValueError(f"Unknown JSON codec: {name}")
+
+codec_name, encode_message, decode_message = load_json_codec()
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """One newline-delimited JSON-RPC frame"""
+    return encode_message(message) + b'\n'
+
+def decode_frame(line: bytes) -> Optional[Dict[str, Any]]:
+    """Parse one frame; None for lines that are not a JSON object (e.g. stray
+    log output).
+    
+    Raises ValueError for lines that look like JSON but do not parse, whatever
+    the codec (msgspec's DecodeError is not a ValueError).
+    """
+    line = line.strip()
+    if not line.startswith(b'{'):
+        return None
+    try:
+        return decode_message(line)
+    except ValueError:
+        raise
+    except Exception as error:
+        raise ValueError(str(error)) from error
+
+class StderrForwarder:
+    """Forward server stderr lines to server_logger through a token bucket.
+    
+    Lines over the rate are dropped and counted; the count is logged once
+    lines are allowed through again.
+    """
+    
+    def __init__(self, rate: float = STDERR_LOG_RATE, burst: int = STDERR_LOG_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.suppressed = 0
+    
+    def forward(self, line: str):
+        line = line.rstrip()
+        if not line:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            self.suppressed += 1
+            return
+        self.tokens -= 1
+        if self.suppressed:
+            server_logger.warning('%d weather server log lines suppressed', self.suppressed)
+            self.suppressed = 0
+        
+        if 'Traceback' in line or 'ERROR' in line or 'CRITICAL' in line:
+            level = logging.ERROR
+        elif 'WARNING' in line:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        server_logger.log(level, '%s', line)
+
+class ToolResultCache:
+    """LRU cache of tool results keyed by tool name and canonical arguments"""
+    
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttls = dict(DEFAULT_TOOL_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def key(tool_name: str, args: Dict[str, Any]) -> str:
+        """Same arguments in any key order (and float noise past 4 decimals) give the same key"""
+        def canonical(value):
+            if isinstance(value, float):
+                return round(value, 4)
+            if isinstance(value, dict):
+                return {k: canonical(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [canonical(v) for v in value]
+            return value
+        return tool_name + ':' + json.dumps(canonical(args), sort_keys=True, separators=(',', ':'))
+    
+    def get(self, tool_name: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if tool_name not in self.ttls:
+            return None
+        key = self.key(tool_name, args)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def put(self, tool_name: str, args: Dict[str, Any], result: Dict[str, Any]):
+        ttl = self.ttls.get(tool_name)
+        # Errors are never cached so the next call retries
+        structured = result.get('structuredContent') or {}
+        if not ttl or result.get('error') or result.get('isError') or structured.get('error'):
+            return
+        key = self.key(tool_name, args)
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+class ToolCatalogCache:
+    """JSON file of tool catalogs keyed by server identity.
+    
+    Each entry holds the raw tools/list result plus any data derived from it
+    (e.g. Gemini function declarations), which is dropped when the tools change.
+    """
+    
+    def __init__(self, path: str = TOOLS_CACHE_PATH):
+        self.path = path
+    
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def load(self, identity: str) -> Optional[Dict[str, Any]]:
+        return self._read().get(identity)
+    
+    def save(self, identity: str, entry: Dict[str, Any]):
+        catalogs = self._read()
+        catalogs[identity] = entry
+        # Write then rename, so workers starting together never read a partial file
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(catalogs, f)
+            os.replace(tmp_path, self.path)
+        except OSError as error:
+            print(f'⚠️ Could not save tool catalog: {error}')
 
 class MCPClient:
-    def __init__(self):
+    def __init__(self, request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 cache_results: bool = RESULT_CACHE_ENABLED, server_url: Optional[str] = MCP_SERVER_URL):
         self.process = None
+        self.server_url = server_url
         self.available_tools = []
+        self.request_timeout = request_timeout
+        self.result_cache = ToolResultCache() if cache_results else None
+        self._reader_task = None
+        self._writer_task = None
+        self._stderr_task = None
+        self._outbound: Optional[asyncio.Queue] = None
+        # Replies are matched to callers by JSON-RPC id, so many calls can share the pipe
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._notification_handlers: Dict[str, List[NotificationHandler]] = {}
+        self._handler_tasks = set()
+        # Persisted tool catalog, revalidated in the background after connect
+        self.tool_catalog = ToolCatalogCache() if TOOLS_CACHE_ENABLED else None
+        self.server_identity = None
+        self._catalog_entry: Dict[str, Any] = {}
+        self._tools_listeners: List[Callable[[], None]] = []
+        self.on_notification('notifications/tools/list_changed', lambda params: self.get_available_tools())
+        # Streamable HTTP transport (only when server_url is set)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._session_id = None
+        self._protocol_version = None
+        self._post_tasks = set()
         
     async def connect(self):
         try:
-            print('🔌 Connecting to MCP Weather Server...')
-            
-            # Start the Python weather server process
-            server_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weather-server-python')
-            server_script = os.path.join(server_dir, 'weather.py')
-
-            if not os.path.isdir(server_dir):
-                raise FileNotFoundError(f"Weather server directory not found: {server_dir}")
-            if not os.path.isfile(server_script):
-                raise FileNotFoundError(f"Weather server script not found: {server_script}")
-
-            self.process = subprocess.Popen(
-                [sys.executable, server_script],
-                cwd=server_dir,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,  # Keep stderr separate
-                text=True,
-                bufsize=0
-            )
-            
-            # Give the server a moment to start
-            import time
-            time.sleep(0.5)
+            if self.server_url:
+                print(f'🔌 Connecting to MCP Weather Server at {self.server_url}...')
+                # One pooled client, so every call reuses a kept-alive connection
+                self._http = httpx.AsyncClient(
+                    timeout=httpx.Timeout(None, connect=STARTUP_TIMEOUT),
+                    limits=httpx.Limits(
+                        max_keepalive_connections=MCP_HTTP_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=MCP_HTTP_KEEPALIVE_EXPIRY
+                    )
+                )
+            else:
+                print('🔌 Connecting to MCP Weather Server...')
+                await self._spawn_server()
             
-            # Initialize the MCP connection with correct protocol version
-            init_message = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "clientInfo": {
-                        "name": "mcp-weather-client",
-                        "version": "1.0.0"
-                    }
+            # Initialize right away: the request waits in the pipe until the server is ready
+            response = await self._request("initialize", {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {
+                    "tools": {}
+                },
+                "clientInfo": {
+                    "name": "mcp-weather-client",
+                    "version": "1.0.0"
                 }
-            }
-            
-            await self._send_message(init_message)
-            response = await self._receive_message()
+            }, timeout=STARTUP_TIMEOUT)
             
             if response.get('error'):
                 raise Exception(f"Initialization failed: {response['error']}")
+            self._protocol_version = response.get('result', {}).get('protocolVersion')
+            self.server_identity = self._identify(response.get('result', {}))
             
             # Send initialized notification
-            initialized_message = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized"
-            }
-            await self._send_message(initialized_message)
+            await self._notify("notifications/initialized")
                 
             print('✅ Connected to MCP Weather Server')
-            await self.get_available_tools()
+            if self._load_cached_tools():
+                # Start with the saved catalog; tools/list runs off the connect path
+                self._run_in_background(self.get_available_tools())
+            else:
+                await self.get_available_tools()
             
         except Exception as error:
             print(f'❌ Weather server connection failed: {error}')
             raise error
     
+    def _identify(self, init_result: Dict[str, Any]) -> str:
+        """Key for the tool catalog: server name/version plus where its code lives"""
+        server_info = init_result.get('serverInfo', {})
+        identity = f"{server_info.get('name')}@{server_info.get('version')}/{init_result.get('protocolVersion')}"
+        if self.server_url:
+            return f'{identity} {self.server_url}'
+        # A spawned server's tools change with its script, which the SDK version does not track
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weather-server-python', 'weather.py')
+        stat = os.stat(script)
+        return f'{identity} {script}:{stat.st_mtime_ns}:{stat.st_size}'
+    
+    def _load_cached_tools(self) -> bool:
+        if not self.tool_catalog:
+            return False
+        entry = self.tool_catalog.load(self.server_identity)
+        if not entry or not entry.get('tools'):
+            return False
+        self._catalog_entry = entry
+        self.available_tools = entry['tools']
+        tool_names = [tool['name'] for tool in self.available_tools]
+        print(f'🌤️ Available weather tools (cached): {", ".join(tool_names)}')
+        return True
+    
+    def cached_tool_data(self, key: str) -> Any:
+        """Data derived from the current tool catalog, e.g. converted schemas"""
+        return self._catalog_entry.get('derived', {}).get(key)
+    
+    def store_tool_data(self, key: str, value: Any):
+        """Save data derived from the current tool catalog next to it on disk"""
+        self._catalog_entry.setdefault('derived', {})[key] = value
+        if self.tool_catalog and self.server_identity:
+            self.tool_catalog.save(self.server_identity, self._catalog_entry)
+    
+    def on_tools_changed(self, callback: Callable[[], None]):
+        """Called after available_tools is replaced by a different catalog"""
+        self._tools_listeners.append(callback)
+    
+    async def _spawn_server(self):
+        """Start a private weather.py and read its stdout in the background"""
+        server_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weather-server-python')
+        server_script = os.path.join(server_dir, 'weather.py')
+
+        if not os.path.isdir(server_dir):
+            raise FileNotFoundError(f"Weather server directory not found: {server_dir}")
+        if not os.path.isfile(server_script):
+            raise FileNotFoundError(f"Weather server script not found: {server_script}")
+
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, server_script,
+            cwd=server_dir,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,  # Keep stderr separate
+            limit=STDIO_LINE_LIMIT
+        )
+        
+        # Read server output in the background so the event loop never blocks on the pipe
+        self._reader_task = asyncio.create_task(self._read_loop())
+        # Keep stderr flowing; a full stderr pipe would stall the server
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        # One writer owns stdin, so bursts queue up (bounded) instead of piling onto drain()
+        self._outbound = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        self._writer_task = asyncio.create_task(self._write_loop())
+    
+    async def _drain_stderr(self):
+        forwarder = StderrForwarder()
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                break
+            forwarder.forward(line.decode(errors='replace'))
+    
+    async def _write_loop(self):
+        try:
+            while True:
+                data = await self._outbound.get()
+                self.process.stdin.write(data)
+                await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # The server is gone; the reader sees EOF and fails waiting calls
+            pass
+    
     async def _send_message(self, message):
-        if self.process and self.process.stdin:
-            json_str = json.dumps(message) + '\n'
-            self.process.stdin.write(json_str)
-            self.process.stdin.flush()
-    
-    async def _receive_message(self):
-        if self.process and self.process.stdout:
-            line = self.process.stdout.readline()
-            if line:
-                line = line.strip()
-                # Skip non-JSON lines (like server startup messages)
-                if line.startswith('{'):
-                    try:
-                        return json.loads(line)
-                    except json.JSONDecodeError as e:
-                        print(f"❌ Invalid JSON from server: {line}")
-                        print(f"❌ JSON Error: {e}")
-                        return {}
-                else:
-                    # This is likely a log message, ignore it and try to read the next line
-                    return await self._receive_message()
+        if self._http is not None:
+            if 'method' in message and 'id' in message:
+                # Each request gets its own POST so calls run concurrently; the reply
+                # comes back on that POST's response and is dispatched from there
+                task = asyncio.create_task(self._post(message))
+                self._post_tasks.add(task)
+                task.add_done_callback(self._post_tasks.discard)
             else:
-                print("📭 No response from server")
-        return {}
+                await self._post(message)
+        elif self._outbound is not None:
+            await self._outbound.put(encode_frame(message))
     
-    async def get_available_tools(self):
+    async def _send_many(self, messages: List[Dict[str, Any]]):
+        """Pipeline several messages: back-to-back frames in a single write, or concurrent POSTs"""
+        if self._http is not None:
+            for message in messages:
+                await self._send_message(message)
+        elif self._outbound is not None:
+            await self._outbound.put(b''.join(encode_frame(message) for message in messages))
+    
+    async def _post(self, message: Dict[str, Any]):
+        """Send one message over streamable HTTP and dispatch whatever comes back"""
+        headers = {'Accept': 'application/json, text/event-stream', 'Content-Type': 'application/json'}
+        if self._session_id:
+            headers['Mcp-Session-Id'] = self._session_id
+        if self._protocol_version:
+            headers['Mcp-Protocol-Version'] = self._protocol_version
+        try:
+            async with self._http.stream('POST', self.server_url, content=encode_message(message), headers=headers) as response:
+                response.raise_for_status()
+                self._session_id = response.headers.get('mcp-session-id', self._session_id)
+                if response.status_code == 202:
+                    return
+                if response.headers.get('content-type', '').startswith('text/event-stream'):
+                    data = []
+                    async for line in response.aiter_lines():
+                        if line.startswith('data:'):
+                            data.append(line[5:].lstrip())
+                        elif not line and data:
+                            await self._dispatch(decode_message('\n'.join(data)))
+                            data = []
+                    if data:
+                        await self._dispatch(decode_message('\n'.join(data)))
+                else:
+                    await self._dispatch(decode_message(await response.aread()))
+        except Exception as error:
+            future = self._pending.get(message.get('id')) if 'method' in message else None
+            if future is None:
+                raise
+            if not future.done():
+                future.set_exception(ConnectionError(f"MCP Weather Server request failed: {error}"))
+    
+    async def _request(self, method: str, params: Optional[Dict[str, Any]] = None,
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a JSON-RPC request and wait for the reply with the same id"""
+        if not self.is_alive:
+            raise ConnectionError("Not connected to MCP Weather Server")
+        
+        request_id = next(self._request_ids)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[request_id] = future
+        timeout = timeout or self.request_timeout
+        deadline = loop.time() + timeout
         try:
-            message = {
+            # Time spent waiting for room in the outbound queue counts against the timeout
+            await asyncio.wait_for(self._send_message({
                 "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list",
-                "params": {}
-            }
+                "id": request_id,
+                "method": method,
+                "params": params or {}
+            }), timeout)
+            return await asyncio.wait_for(future, max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            # Tell the server to stop working on it; a late reply is dropped by the reader
+            self._run_in_background(self._notify("notifications/cancelled", {
+                "requestId": request_id,
+                "reason": "Client timed out"
+            }))
+            raise TimeoutError(f"{method} timed out")
+        finally:
+            self._pending.pop(request_id, None)
+    
+    async def _request_many(self, requests: List[Tuple[str, Dict[str, Any]]],
+                            timeout: Optional[float] = None) -> List[Any]:
+        """Send several requests in one write and return the replies in order.
+        
+        Items that failed or timed out hold the exception instead of a reply.
+        """
+        if not self.is_alive:
+            raise ConnectionError("Not connected to MCP Weather Server")
+        
+        loop = asyncio.get_running_loop()
+        messages = []
+        for method, params in requests:
+            request_id = next(self._request_ids)
+            self._pending[request_id] = loop.create_future()
+            messages.append({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        timeout = timeout or self.request_timeout
+        deadline = loop.time() + timeout
+        try:
+            await asyncio.wait_for(self._send_many(messages), timeout)
+            await asyncio.wait([self._pending[m['id']] for m in messages], timeout=max(deadline - loop.time(), 0))
             
-            await self._send_message(message)
-            response = await self._receive_message()
+            replies = []
+            for message in messages:
+                future = self._pending[message['id']]
+                if future.done():
+                    replies.append(future.exception() or future.result())
+                else:
+                    self._run_in_background(self._notify("notifications/cancelled", {
+                        "requestId": message['id'],
+                        "reason": "Client timed out"
+                    }))
+                    replies.append(TimeoutError(f"{message['method']} timed out"))
+            return replies
+        finally:
+            for message in messages:
+                self._pending.pop(message['id'], None)
+    
+    async def _notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Send a JSON-RPC notification (no reply expected)"""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send_message(message)
+    
+    def on_notification(self, method: str, handler: NotificationHandler):
+        """Register a callback for server notifications such as notifications/tools/list_changed"""
+        self._notification_handlers.setdefault(method, []).append(handler)
+    
+    async def _read_loop(self):
+        """Read JSON-RPC messages from the server's stdout and dispatch them until it closes"""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = decode_frame(line)
+                except ValueError as e:
+                    print(f"❌ Invalid JSON from server: {line[:200]!r}")
+                    print(f"❌ JSON Error: {e}")
+                    continue
+                # Skip non-JSON lines (like server startup messages)
+                if message is not None:
+                    await self._dispatch(message)
+        finally:
+            self._fail_pending()
+    
+    def _fail_pending(self):
+        """Fail every call still waiting for a reply"""
+        waiting = [future for future in self._pending.values() if not future.done()]
+        for future in waiting:
+            future.set_exception(ConnectionError("MCP Weather Server closed the connection"))
+        if waiting:
+            print("📭 No response from server")
+    
+    async def _dispatch(self, message: Dict[str, Any]):
+        """Route a message to the waiting call, a notification handler or the request handler"""
+        if 'method' not in message:
+            future = self._pending.get(message.get('id'))
+            if future is not None and not future.done():
+                future.set_result(message)
+            return
+        
+        if 'id' in message:
+            # Server-to-client request; we only support ping
+            if message['method'] == 'ping':
+                reply = {"jsonrpc": "2.0", "id": message['id'], "result": {}}
+            else:
+                reply = {
+                    "jsonrpc": "2.0",
+                    "id": message['id'],
+                    "error": {"code": -32601, "message": f"Method not found: {message['method']}"}
+                }
+            # Never let the reader wait on a full outbound queue
+            self._run_in_background(self._send_message(reply))
+            return
+        
+        for handler in self._notification_handlers.get(message['method'], []):
+            try:
+                result = handler(message.get('params', {}))
+                if asyncio.iscoroutine(result):
+                    # Run async handlers off the reader loop so they can make requests themselves
+                    self._run_in_background(result)
+            except Exception as error:
+                print(f"❌ Notification handler failed for {message['method']}: {error}")
+    
+    def _run_in_background(self, coro):
+        task = asyncio.create_task(coro)
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+    
+    async def get_available_tools(self):
+        try:
+            response = await self._request("tools/list")
             
-
+            tools = response.get('result', {}).get('tools', [])
+            if self._catalog_entry and tools == self.available_tools:
+                return
             
-            self.available_tools = response.get('result', {}).get('tools', [])
+            self.available_tools = tools
             tool_names = [tool['name'] for tool in self.available_tools]
             print(f'🌤️ Available weather tools: {", ".join(tool_names)}')
             
+            changed = bool(self._catalog_entry)
+            self._catalog_entry = {'tools': tools}
+            if self.tool_catalog and self.server_identity:
+                self.tool_catalog.save(self.server_identity, self._catalog_entry)
+            if changed:
+                for callback in self._tools_listeners:
+                    callback()
+            
         except Exception as error:
             print(f'❌ Failed to get weather tools: {error}')
     
@@ -132,39 +618,278 @@ class MCPClient:
             for tool in self.available_tools
         ]
     
-    async def call_mcp_tool(self, tool_name: str, args: Dict[str, Any]):
+    async def call_mcp_tool(self, tool_name: str, args: Dict[str, Any], timeout: Optional[float] = None,
+                            use_cache: bool = True):
+        """Call a server tool. use_cache=False skips the cached result and refreshes it."""
+        if use_cache and self.result_cache:
+            cached = self.result_cache.get(tool_name, args)
+            if cached is not None:
+                return cached
+        
         try:
             print(f'🌤️ Getting weather data: {tool_name}({json.dumps(args)})')
             
-            message = {
-                "jsonrpc": "2.0",
-                "id": 3,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": args
-                }
-            }
-            
-            await self._send_message(message)
-            response = await self._receive_message()
-            
-            if response.get('error'):
-                return {'error': response['error']['message']}
-            
-            result = response.get('result', {})
+            response = await self._request("tools/call", {
+                "name": tool_name,
+                "arguments": args
+            }, timeout=timeout)
+        except Exception as error:
+            response = error
+        return self._tool_result(tool_name, args, response)
+    
+    async def call_many(self, calls: List[Tuple[str, Dict[str, Any]]], timeout: Optional[float] = None,
+                        use_cache: bool = True) -> List[Dict[str, Any]]:
+        """Call several tools in one write; results come back in the order of calls.
+        
+        Each result is what call_mcp_tool would return for that call, so one
+        failing item ({'error': ...}) does not affect the others.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        misses = []
+        for index, (tool_name, args) in enumerate(calls):
+            if use_cache and self.result_cache:
+                results[index] = self.result_cache.get(tool_name, args)
+            if results[index] is None:
+                misses.append(index)
+        if not misses:
+            return results
+        
+        print(f'🌤️ Getting weather data: {len(misses)} calls (pipelined)')
+        try:
+            replies = await self._request_many(
+                [("tools/call", {"name": calls[i][0], "arguments": calls[i][1]}) for i in misses],
+                timeout=timeout
+            )
+        except Exception as error:
+            replies = [error] * len(misses)
+        for index, reply in zip(misses, replies):
+            results[index] = self._tool_result(calls[index][0], calls[index][1], reply)
+        return results
+    
+    def _tool_result(self, tool_name: str, args: Dict[str, Any], response: Any) -> Dict[str, Any]:
+        """Turn a tools/call reply (or the exception that replaced it) into a result dict"""
+        if isinstance(response, Exception):
+            print(f'❌ Weather tool call failed: {response}')
+            return {'error': str(response)}
+        if response.get('error'):
+            return {'error': response['error']['message']}
+        
+        result = response.get('result', {})
+        if self.result_cache:
+            self.result_cache.put(tool_name, args, result)
+        return result
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of requests waiting for a reply"""
+        return len(self._pending)
+    
+    @property
+    def is_alive(self) -> bool:
+        if self._http is not None:
+            return not self._http.is_closed
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+            and not self._writer_task.done()
+        )
+    
+    async def disconnect(self):
+        if self._http is not None:
+            for task in self._post_tasks:
+                task.cancel()
+            self._fail_pending()
+            if self._session_id:
+                # End the server-side session instead of waiting for it to idle out
+                try:
+                    await self._http.delete(self.server_url, headers={'Mcp-Session-Id': self._session_id})
+                except httpx.HTTPError:
+                    pass
+            await self._http.aclose()
+            self._http = None
+            self._session_id = None
+            print('👋 Disconnected from MCP Weather Server')
+        if self.process:
+            if self.process.returncode is None:
+                self.process.terminate()
+            await self.process.wait()
+            for task in (self._reader_task, self._writer_task, self._stderr_task):
+                if task:
+                    task.cancel()
+            self._reader_task = self._writer_task = self._stderr_task = None
+            self._outbound = None
+            print('👋 Disconnected from MCP Weather Server')
 
-            return result
-            
+class MCPClientPool:
+    """Several weather server processes behind the MCPClient interface.
+    
+    Each call goes to the healthy member with the fewest requests in flight,
+    and members whose process died are replaced in the background. A member
+    that fails to restart is retried after an exponential backoff.
+    """
+    
+    def __init__(self, size: Optional[int] = None, request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 cache_results: bool = RESULT_CACHE_ENABLED):
+        self.size = size or os.cpu_count() or 1
+        self.request_timeout = request_timeout
+        # One cache for the whole pool, in front of member selection
+        self.result_cache = ToolResultCache() if cache_results else None
+        self.members: List[MCPClient] = []
+        self._tools_listeners: List[Callable[[], None]] = []
+        self._replacing: Dict[int, asyncio.Task] = {}
+        self._restart_failures: Dict[int, int] = {}
+        self._retry_at: Dict[int, float] = {}
+    
+    async def connect(self):
+        print(f'🔌 Starting pool of {self.size} MCP Weather Servers...')
+        self.members = [MCPClient(self.request_timeout, cache_results=False) for _ in range(self.size)]
+        for member in self.members:
+            member.on_tools_changed(self._tools_changed)
+        await asyncio.gather(*(member.connect() for member in self.members))
+    
+    @property
+    def available_tools(self):
+        return self.members[0].available_tools if self.members else []
+    
+    def cached_tool_data(self, key: str) -> Any:
+        return self.members[0].cached_tool_data(key) if self.members else None
+    
+    def store_tool_data(self, key: str, value: Any):
+        if self.members:
+            self.members[0].store_tool_data(key, value)
+    
+    def on_tools_changed(self, callback: Callable[[], None]):
+        self._tools_listeners.append(callback)
+    
+    def _tools_changed(self):
+        for callback in self._tools_listeners:
+            callback()
+    
+    def _replace(self, index: int) -> Optional[asyncio.Task]:
+        """Start (or join) the replacement of a dead member; None while it is backing off"""
+        task = self._replacing.get(index)
+        if task is None:
+            if time.monotonic() < self._retry_at.get(index, 0.0):
+                return None
+            task = asyncio.create_task(self._restart_member(index))
+            self._replacing[index] = task
+            task.add_done_callback(lambda _: self._replacing.pop(index, None))
+        return task
+    
+    async def _restart_member(self, index: int):
+        print(f'♻️ Replacing dead MCP Weather Server #{index}')
+        old = self.members[index]
+        try:
+            await old.disconnect()
+        except Exception:
+            pass
+        member = MCPClient(self.request_timeout, cache_results=False)
+        member.on_tools_changed(self._tools_changed)
+        try:
+            await member.connect()
+        except Exception as error:
+            # Left dead, and not tried again until the backoff has passed
+            failures = self._restart_failures.get(index, 0) + 1
+            self._restart_failures[index] = failures
+            backoff = min(POOL_RESTART_BACKOFF * 2 ** (failures - 1), POOL_RESTART_BACKOFF_MAX)
+            self._retry_at[index] = time.monotonic() + backoff
+            print(f'❌ Could not replace MCP Weather Server #{index}: {error} (retrying in {backoff:.0f}s)')
+            try:
+                await member.disconnect()
+            except Exception:
+                pass
+            return
+        self._restart_failures.pop(index, None)
+        self._retry_at.pop(index, None)
+        self.members[index] = member
+    
+    def _healthy_members(self) -> List[MCPClient]:
+        healthy = []
+        for index, member in enumerate(self.members):
+            if member.is_alive:
+                healthy.append(member)
+            else:
+                self._replace(index)
+        return healthy
+    
+    async def _pick_member(self) -> MCPClient:
+        healthy = self._healthy_members()
+        
+        # Everything is down: wait for this round of replacements, but never start another
+        while not healthy and self._replacing:
+            await asyncio.wait(list(self._replacing.values()), return_when=asyncio.FIRST_COMPLETED)
+            healthy = [member for member in self.members if member.is_alive]
+        
+        if not healthy:
+            if not self.members:
+                raise ConnectionError("MCP client pool is not connected")
+            raise ConnectionError("No MCP Weather Server is running; restarts are backing off")
+        return min(healthy, key=lambda member: member.in_flight)
+    
+    async def call_mcp_tool(self, tool_name: str, args: Dict[str, Any], timeout: Optional[float] = None,
+                            use_cache: bool = True):
+        if use_cache and self.result_cache:
+            cached = self.result_cache.get(tool_name, args)
+            if cached is not None:
+                return cached
+        
+        try:
+            member = await self._pick_member()
         except Exception as error:
             print(f'❌ Weather tool call failed: {error}')
             return {'error': str(error)}
+        result = await member.call_mcp_tool(tool_name, args, timeout=timeout)
+        if self.result_cache:
+            self.result_cache.put(tool_name, args, result)
+        return result
+    
+    async def call_many(self, calls: List[Tuple[str, Dict[str, Any]]], timeout: Optional[float] = None,
+                        use_cache: bool = True) -> List[Dict[str, Any]]:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        misses = []
+        for index, (tool_name, args) in enumerate(calls):
+            if use_cache and self.result_cache:
+                results[index] = self.result_cache.get(tool_name, args)
+            if results[index] is None:
+                misses.append(index)
+        if not misses:
+            return results
+        
+        try:
+            member = await self._pick_member()
+        except Exception as error:
+            print(f'❌ Weather tool call failed: {error}')
+            member_results = [{'error': str(error)}] * len(misses)
+        else:
+            member_results = await member.call_many([calls[i] for i in misses], timeout=timeout)
+        for index, result in zip(misses, member_results):
+            results[index] = result
+            if self.result_cache:
+                self.result_cache.put(calls[index][0], calls[index][1], result)
+        return results
+    
+    def convert_tools_to_gemini_schema(self):
+        return self.members[0].convert_tools_to_gemini_schema() if self.members else []
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-member health and queue depth"""
+        return [
+            {
+                'member': index,
+                'pid': member.process.pid if member.process else None,
+                'alive': member.is_alive,
+                'queue_depth': member.in_flight
+            }
+            for index, member in enumerate(self.members)
+        ]
     
     async def disconnect(self):
-        if self.process:
-            self.process.terminate()
-            self.process.wait()
-            print('👋 Disconnected from MCP Weather Server')
+        for task in list(self._replacing.values()):
+            task.cancel()
+        await asyncio.gather(*(member.disconnect() for member in self.members), return_exceptions=True)
+        self.members = []
 
 class MCPWeatherClient:
     def __init__(self):
@@ -5,10 +5,17 @@ Hybrid approach: Gemini AI + MCP Weather Server
 """
 
 import asyncio
+import functools
+import hashlib
 import json
 import os
+import re
 import sys
-from typing import List, Dict, Any, Optional
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 import google.generativeai as genai
 from dotenv import load_dotenv
 from client import MCPClient
@@ -16,13 +23,132 @@ from client import MCPClient
 # Load environment variables from .env file
 load_dotenv()
 
+# Threads for Gemini calls that have no async API, so they never block the event loop
+GEMINI_THREAD_POOL_SIZE = int(os.getenv('GEMINI_THREAD_POOL_SIZE', '8'))
+_gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_THREAD_POOL_SIZE, thread_name_prefix='gemini')
+
+# Cache of Gemini answers for the same question, city and forecast
+ANSWER_CACHE_TTL = float(os.getenv('GEMINI_ANSWER_CACHE_TTL', '600'))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv('GEMINI_ANSWER_CACHE_MAX_ENTRIES', '512'))
+ANSWER_CACHE_MAX_BYTES = int(os.getenv('GEMINI_ANSWER_CACHE_MAX_BYTES', str(4 * 1024 * 1024)))
+
+class AnswerCache:
+    """
+    LRU cache of Gemini answers keyed on the normalized question, the city and
+    a hash of the weather data the answer was based on
+    
+    A new forecast hashes differently, so answers turn over with the data;
+    old ones age out by TTL or are evicted once the entry or byte bound is hit.
+    """
+    
+    def __init__(self, ttl: float = ANSWER_CACHE_TTL, max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+                 max_bytes: int = ANSWER_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def key(question: str, city: str, weather_data: str) -> str:
+        # "Umbrella in NYC?" and "umbrella in nyc" are the same question
+        normalized = re.sub(r'\s+', ' ', question.lower()).strip().rstrip('?!. ')
+        weather_hash = hashlib.sha256(weather_data.encode()).hexdigest()[:16]
+        return f'{city.lower()}|{weather_hash}|{normalized}'
+    
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def put(self, key: str, answer: str):
+        if key in self._entries:
+            self._remove(key)
+        size = len(answer.encode())
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, answer)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+    
+    def _remove(self, key: str):
+        _, answer = self._entries.pop(key)
+        self._bytes -= len(answer.encode())
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+# Compass letters as NWS spells them in detailedForecast ("NNW" -> "north northwest")
+COMPASS_WORDS = {'n': 'north', 'e': 'east', 's': 'south', 'w': 'west'}
+
+# Periods asked for from get_forecast: the full NWS week, so named days can be found
+CITY_FORECAST_PERIODS = 14
+
+# Periods sent for questions that name no day (the get_forecast default)
+DEFAULT_PROMPT_PERIODS = 5
+
+# Questions about a span of days get the whole fetched forecast
+WEEK_RANGE = re.compile(r"\bweek\b|\b(next|coming) (few |couple of |\d+ )?days\b|\blater\b")
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+# States recognized by the alerts shortcut
+ALERT_STATES = {
+    'california': 'CA', 'texas': 'TX', 'florida': 'FL', 'new york': 'NY',
+    'illinois': 'IL', 'washington': 'WA', 'arizona': 'AZ'
+}
+
+# Version of the MCP -> Gemini schema conversion. Bump it whenever
+# _convert_input_schema/_convert_property_schema change, so declarations
+# saved with the tool catalog are rebuilt instead of reused.
+SCHEMA_CONVERTER_VERSION = 2
+
+# Function-calling turns allowed per question before Gemini must answer
+TOOL_STEP_BUDGET = int(os.getenv('GEMINI_TOOL_STEP_BUDGET', '4'))
+
+TOOL_SYSTEM_PROMPT = """You are a helpful weather assistant with access to real-time weather data for US cities. 
+        
+You can:
+- Get weather forecasts for any US city using coordinates
+- Get forecasts for several locations at once with get_forecasts
+- Check weather alerts for US states
+- Provide weather advice and recommendations
+- Answer weather-related questions in a friendly, conversational manner
+
+Available US cities include major cities like New York, Los Angeles, Chicago, Houston, etc.
+For weather alerts, use 2-letter US state codes (CA, NY, TX, etc.).
+When a question involves several places, request all the data you need in the same turn.
+
+Be conversational and helpful. If someone asks about weather, use the appropriate tools to get current data.
+"""
+
 class GeminiMCPClient:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, mcp_client: Optional[MCPClient] = None):
         """
         Initialize Gemini client with MCP integration
         
         Args:
             api_key: Google AI API key. If None, will try to get from environment
+            mcp_client: MCP client to use, e.g. an MCPClientPool. Defaults to a single MCPClient
         """
         self.api_key = api_key or os.getenv('GOOGLE_AI_API_KEY')
         if not self.api_key:
@@ -32,10 +158,19 @@ class GeminiMCPClient:
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel('gemini-1.5-pro')
         
+        # Answers already generated for the same question and forecast
+        self.answer_cache = AnswerCache()
+        
         # MCP Weather Client
-        self.mcp_client = MCPClient()
+        self.mcp_client = mcp_client or MCPClient()
         self.available_tools = []
         
+        # Prompt/output tokens spent on Gemini calls so far
+        self.token_usage = {'calls': 0, 'prompt_tokens': 0, 'output_tokens': 0}
+        
+        # Tool-enabled model, built once the tool catalog is known
+        self.tool_model = None
+        
         # Chat session
         self.chat = None
         
@@ -47,6 +182,8 @@ class GeminiMCPClient:
             
             # Get available tools and convert to Gemini format
             self.available_tools = self.convert_mcp_tools_to_gemini_format()
+            self._build_tool_model()
+            self.mcp_client.on_tools_changed(self._refresh_tools)
             
             # Initialize Gemini chat with tools
             self.chat = self.model.start_chat(
@@ -61,13 +198,114 @@ class GeminiMCPClient:
             print(f'❌ Connection failed: {error}')
             raise error
     
+    async def _generate(self, model: genai.GenerativeModel, contents: Any, **kwargs):
+        """
+        Run generate_content without blocking the event loop
+        
+        Uses the SDK's async API, or the bounded Gemini thread pool where a
+        model object has none.
+        """
+        generate_async = getattr(model, 'generate_content_async', None)
+        if generate_async is not None:
+            response = await generate_async(contents, **kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                _gemini_executor, functools.partial(model.generate_content, contents, **kwargs)
+            )
+        self._record_usage(response)
+        return response
+    
+    def _record_usage(self, response):
+        """Log one call's prompt/output token counts and add them to token_usage"""
+        usage = getattr(response, 'usage_metadata', None)
+        if not usage:
+            return
+        prompt_tokens = usage.prompt_token_count
+        output_tokens = usage.candidates_token_count
+        self.token_usage['calls'] += 1
+        self.token_usage['prompt_tokens'] += prompt_tokens
+        self.token_usage['output_tokens'] += output_tokens
+        print(f'📊 Gemini tokens: prompt={prompt_tokens} output={output_tokens}')
+    
+    async def _generate_stream(self, model: genai.GenerativeModel, contents: Any) -> AsyncIterator[str]:
+        """Yield response text chunks as Gemini produces them"""
+        async for chunk in self._stream_chunks(model, contents):
+            text = self._chunk_text(chunk)
+            if text:
+                yield text
+    
+    async def _stream_chunks(self, model: genai.GenerativeModel, contents: Any, **kwargs) -> AsyncIterator[Any]:
+        """
+        Yield raw response chunks as Gemini produces them
+        
+        Uses the SDK's async streaming API, or iterates the sync stream on the
+        bounded Gemini thread pool where a model object has no async method.
+        """
+        generate_async = getattr(model, 'generate_content_async', None)
+        if generate_async is not None:
+            response = await generate_async(contents, stream=True, **kwargs)
+            last_chunk = None
+            async for chunk in response:
+                last_chunk = chunk
+                yield chunk
+            # The final chunk carries the totals for the whole stream
+            self._record_usage(last_chunk)
+            return
+        
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        def produce():
+            try:
+                last_chunk = None
+                for chunk in model.generate_content(contents, stream=True, **kwargs):
+                    last_chunk = chunk
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+                loop.call_soon_threadsafe(self._record_usage, last_chunk)
+            except Exception as error:
+                loop.call_soon_threadsafe(chunks.put_nowait, error)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, done)
+        
+        loop.run_in_executor(_gemini_executor, produce)
+        while True:
+            item = await chunks.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        # .text raises for chunks without text parts (e.g. safety or function-call chunks)
+        try:
+            return chunk.text
+        except ValueError:
+            return ''
+    
+    def _refresh_tools(self):
+        """Rebuild function declarations after the server's tool list changed"""
+        self.available_tools = self.convert_mcp_tools_to_gemini_format()
+        self._build_tool_model()
+        print(f'🔄 Weather tools updated: {[tool["name"] for tool in self.available_tools]}')
+    
     def convert_mcp_tools_to_gemini_format(self) -> List[Dict[str, Any]]:
         """
         Convert MCP tools to Gemini Function Calling format
         
+        The result is saved with the MCP client's tool catalog, so later
+        starts against the same server skip the conversion.
+        
         Returns:
             List of Gemini-compatible function declarations
         """
+        cached = self.mcp_client.cached_tool_data('gemini')
+        if isinstance(cached, dict) and cached.get('converter_version') == SCHEMA_CONVERTER_VERSION:
+            return cached['declarations']
+        
         gemini_tools = []
         
         for tool in self.mcp_client.available_tools:
@@ -79,6 +317,11 @@ class GeminiMCPClient:
             }
             gemini_tools.append(gemini_tool)
         
+        if gemini_tools:
+            self.mcp_client.store_tool_data('gemini', {
+                'converter_version': SCHEMA_CONVERTER_VERSION,
+                'declarations': gemini_tools
+            })
         return gemini_tools
     
     def _convert_input_schema(self, input_schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -102,19 +345,49 @@ class GeminiMCPClient:
         }
         
         # Convert properties
+        definitions = input_schema.get("$defs", {})
         properties = input_schema.get("properties", {})
         for prop_name, prop_schema in properties.items():
-            gemini_params["properties"][prop_name] = {
-                "type": prop_schema.get("type", "string"),
-                "description": prop_schema.get("description", "")
-            }
-            
-            # Handle enum values
-            if "enum" in prop_schema:
-                gemini_params["properties"][prop_name]["enum"] = prop_schema["enum"]
+            gemini_params["properties"][prop_name] = self._convert_property_schema(prop_schema, definitions)
         
         return gemini_params
     
+    def _convert_property_schema(self, prop_schema: Dict[str, Any], definitions: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a single JSON Schema property to Gemini format
+        
+        Args:
+            prop_schema: JSON Schema of the property
+            definitions: "$defs" of the enclosing schema, used to resolve "$ref"
+            
+        Returns:
+            Gemini-compatible property schema
+        """
+        # Gemini has no "$ref", so inline referenced definitions
+        if "$ref" in prop_schema:
+            prop_schema = definitions.get(prop_schema["$ref"].split("/")[-1], {})
+        
+        gemini_prop = {
+            "type": prop_schema.get("type", "string"),
+            "description": prop_schema.get("description", "")
+        }
+        
+        # Handle enum values
+        if "enum" in prop_schema:
+            gemini_prop["enum"] = prop_schema["enum"]
+        
+        # Handle arrays and nested objects
+        if "items" in prop_schema:
+            gemini_prop["items"] = self._convert_property_schema(prop_schema["items"], definitions)
+        if "properties" in prop_schema:
+            gemini_prop["properties"] = {
+                name: self._convert_property_schema(schema, definitions)
+                for name, schema in prop_schema["properties"].items()
+            }
+            gemini_prop["required"] = prop_schema.get("required", [])
+        
+        return gemini_prop
+    
     async def chat_with_weather(self, user_message: str) -> str:
         """
         Chat with Gemini AI that can access weather tools
@@ -131,16 +404,18 @@ class GeminiMCPClient:
             # Simple approach: Let's manually handle common weather queries first
             # and call MCP tools directly, then format response
             
-            user_lower = user_message.lower()
+            route = self._route_message(user_message)
             
-            # Check for city weather requests
-            if any(city in user_lower for city in ['houston', 'new york', 'los angeles', 'chicago', 'miami', 'seattle', 'phoenix']):
+            if route == 'city':
                 return await self._handle_city_weather(user_message)
             
-            # Check for alerts
-            elif any(word in user_lower for word in ['alert', 'warning', 'storm']):
+            elif route == 'alerts':
                 return await self._handle_weather_alerts(user_message)
             
+            elif route == 'tools':
+                # Several places or an open question: let Gemini pick the tools
+                return await self._generate_with_tools(user_message)
+            
             else:
                 # General weather response
                 return await self._generate_simple_response(user_message)
@@ -149,84 +424,267 @@ class GeminiMCPClient:
             print(f'❌ Chat error: {error}')
             return f"Sorry, I encountered an error: {error}"
     
-    async def _generate_with_tools(self, message: str, tools: List) -> str:
+    async def chat_with_weather_stream(self, user_message: str) -> AsyncIterator[str]:
         """
-        Generate response with tool calling capability
+        Same as chat_with_weather, but yields the answer in chunks as Gemini
+        generates it instead of returning it at the end
         
         Args:
-            message: User message
-            tools: Available Gemini tools
+            user_message: User's question about weather
             
-        Returns:
-            Final response after tool calls
+        Yields:
+            Pieces of the assistant's response
+        """
+        try:
+            print(f'🧠 Streaming with Gemini AI: {user_message}')
+            route = self._route_message(user_message)
+            
+            if route == 'city':
+                city, weather_data = await self._fetch_city_weather(user_message)
+                if city is None:
+                    yield weather_data
+                    return
+                cache_key = self.answer_cache.key(user_message, city, weather_data)
+                cached = self.answer_cache.get(cache_key)
+                if cached is not None:
+                    yield cached
+                    return
+                prompt = self._intelligent_prompt(user_message, city, weather_data)
+                fallback = f"🌤️ Here's the weather for {city.title()}:\n\n{weather_data}"
+            
+            elif route == 'alerts':
+                yield await self._handle_weather_alerts(user_message)
+                return
+            
+            elif route == 'tools':
+                async for chunk in self._generate_with_tools_stream(user_message):
+                    yield chunk
+                return
+            
+            else:
+                cache_key = None
+                prompt = self._simple_prompt(user_message)
+                fallback = "I understand you're asking about weather. Could you be more specific about which US city or state you're interested in?"
+            
+            streamed = []
+            try:
+                async for chunk in self._generate_stream(self.model, prompt):
+                    streamed.append(chunk)
+                    yield chunk
+                if cache_key and streamed:
+                    self.answer_cache.put(cache_key, ''.join(streamed))
+            except Exception as e:
+                print(f"❌ Gemini response error: {e}")
+                # Same fallback as the non-streaming path, unless part of an answer is already out
+                if not streamed:
+                    yield fallback
+            
+        except Exception as error:
+            print(f'❌ Chat error: {error}')
+            yield f"Sorry, I encountered an error: {error}"
+    
+    def _route_message(self, user_message: str) -> str:
         """
-        # System prompt for weather assistant
-        system_prompt = """You are a helpful weather assistant with access to real-time weather data for US cities. 
+        Pick how to answer: one 'city' forecast, state 'alerts', the Gemini
+        'tools' loop, or a 'general' reply when no tools are available
+        """
+        user_lower = user_message.lower()
         
-You can:
-- Get weather forecasts for any US city using coordinates
-- Check weather alerts for US states
-- Provide weather advice and recommendations
-- Answer weather-related questions in a friendly, conversational manner
-
-Available US cities include major cities like New York, Los Angeles, Chicago, Houston, etc.
-For weather alerts, use 2-letter US state codes (CA, NY, TX, etc.).
-
-Be conversational and helpful. If someone asks about weather, use the appropriate tools to get current data.
-"""
+        # Check for city weather requests
+        cities = [city for city in ['houston', 'new york', 'los angeles', 'chicago', 'miami', 'seattle', 'phoenix'] if city in user_lower]
+        if len(cities) == 1:
+            return 'city'
         
-        # Combine system prompt with user message
-        full_prompt = f"{system_prompt}\n\nUser: {message}\nAssistant:"
+        # Check for alerts (in a single state)
+        states = [name for name in ALERT_STATES if name in user_lower]
+        if not cities and len(states) <= 1 and any(word in user_lower for word in ['alert', 'warning', 'storm']):
+            return 'alerts'
         
-        # Generate response
-        model_with_tools = genai.GenerativeModel(
+        return 'tools' if self.tool_model else 'general'
+    
+    def _build_tool_model(self):
+        """Create the tool-enabled model once per tool catalog instead of per question"""
+        if not self.available_tools:
+            self.tool_model = None
+            return
+        self.tool_model = genai.GenerativeModel(
             'gemini-1.5-pro',
-            tools=tools,
-            system_instruction=system_prompt
+            tools=[{"function_declarations": self.available_tools}],
+            system_instruction=TOOL_SYSTEM_PROMPT
         )
+    
+    async def _generate_with_tools(self, message: str) -> str:
+        """
+        Generate response with tool calling capability
         
-        response = model_with_tools.generate_content(message)
-        
-        # Handle function calls
-        if response.candidates[0].content.parts:
-            final_response_parts = []
-            
-            for part in response.candidates[0].content.parts:
-                if hasattr(part, 'function_call') and part.function_call:
-                    # Execute the function call via MCP
-                    function_name = part.function_call.name
-                    function_args = dict(part.function_call.args)
-                    
-                    print(f'🔧 Calling weather tool: {function_name}({function_args})')
-                    
-                    # Call MCP tool
-                    mcp_result = await self.mcp_client.call_mcp_tool(function_name, function_args)
-                    
-                    # Format the result for Gemini
-                    tool_result = self._format_mcp_result(mcp_result)
-                    
-                    # Continue conversation with tool result
-                    follow_up_response = model_with_tools.generate_content([
-                        message,
-                        response.candidates[0].content,
-                        genai.protos.Content(parts=[
-                            genai.protos.Part(
-                                function_response=genai.protos.FunctionResponse(
-                                    name=function_name,
-                                    response={"result": tool_result}
-                                )
-                            )
-                        ])
-                    ])
-                    
-                    return follow_up_response.text
-                
-                elif hasattr(part, 'text') and part.text:
-                    final_response_parts.append(part.text)
+        Args:
+            message: User message
+            
+        Returns:
+            Final response after tool calls
+        """
+        return ''.join([chunk async for chunk in self._generate_with_tools_stream(message)])
+    
+    async def _generate_with_tools_stream(self, message: str) -> AsyncIterator[str]:
+        """
+        Run the function-calling loop, streaming the answer text
+        
+        Each turn is streamed: every function call Gemini asks for is executed
+        against the MCP server in one concurrent batch and the results are sent
+        back, and text is yielded as soon as it arrives, so the final answer
+        reaches the caller token by token. When the step budget runs out,
+        Gemini answers with what has been fetched so far.
+        """
+        contents: List[Any] = [{"role": "user", "parts": [message]}]
+        answered = False
+        
+        for step in range(TOOL_STEP_BUDGET + 1):
+            kwargs = {}
+            if step == TOOL_STEP_BUDGET:
+                print(f'⚠️ Tool step budget ({TOOL_STEP_BUDGET}) used up, asking for a final answer')
+                kwargs['tool_config'] = {"function_calling_config": {"mode": "NONE"}}
+            
+            function_calls = []
+            async for chunk in self._stream_chunks(self.tool_model, contents, **kwargs):
+                parts = chunk.candidates[0].content.parts if chunk.candidates else []
+                for part in parts:
+                    if part.function_call.name:
+                        function_calls.append(part.function_call)
+                    elif part.text:
+                        answered = True
+                        yield part.text
+            if not function_calls:
+                break
             
-            return "".join(final_response_parts)
+            contents.append(genai.protos.Content(role="model", parts=[
+                genai.protos.Part(function_call=call) for call in function_calls
+            ]))
+            contents.append(await self._run_function_calls(function_calls))
         
-        return response.text if response.text else "I'm sorry, I couldn't generate a response."
+        if not answered:
+            yield "I'm sorry, I couldn't generate a response."
+    
+    async def _run_function_calls(self, function_calls: List[Any]) -> genai.protos.Content:
+        """Execute one turn's function calls concurrently and wrap the results for Gemini"""
+        calls = [
+            (call.name, genai.protos.FunctionCall.to_dict(call).get("args", {}))
+            for call in function_calls
+        ]
+        for name, args in calls:
+            print(f'🔧 Calling weather tool: {name}({args})')
+        
+        if len(calls) == 1:
+            results = [await self.mcp_client.call_mcp_tool(*calls[0])]
+        else:
+            results = await self.mcp_client.call_many(calls)
+        
+        return genai.protos.Content(role="function", parts=[
+            genai.protos.Part(
+                function_response=genai.protos.FunctionResponse(
+                    name=name,
+                    response={"result": self._format_mcp_result(result)}
+                )
+            )
+            for (name, _), result in zip(calls, results)
+        ])
+    
+    @staticmethod
+    def _field_sentences(period: Dict[str, Any]) -> set:
+        """
+        detailedForecast sentences (lowercased, no final period) that say
+        exactly what the structured fields of the period already say, e.g.
+        "mostly cloudy, with a low around 50" or "west wind 5 to 15 mph"
+        """
+        short = (period.get('shortForecast') or '').lower()
+        sentences = {short}
+        
+        temperature = period.get('temperatureF')
+        for bound in ('high', 'low'):
+            for word in ('near', 'around'):
+                clause = f'with a {bound} {word} {temperature}'
+                sentences.update({clause, f'{short}, {clause}', f'{bound} {word} {temperature}'})
+        
+        speed = (period.get('windSpeed') or '').lower()
+        letters = (period.get('windDirection') or '').lower()
+        words = [COMPASS_WORDS.get(letter, letter) for letter in letters]
+        direction = ' '.join([words[0], ''.join(words[1:])]) if len(words) == 3 else ''.join(words)
+        for amount in (speed, f'around {speed}'):
+            sentences.update({f'{direction} wind {amount}', f'wind {amount}'})
+        
+        if period.get('precipitationChance') is not None:
+            sentences.add(f"chance of precipitation is {period['precipitationChance']}%")
+        return sentences
+    
+    def _compact_forecast(self, periods: List[Dict[str, Any]]) -> str:
+        """
+        Encode forecast periods for a prompt: one line per period with the
+        structured fields, plus the detailedForecast sentences that add
+        something new (not an exact restatement of the fields on the line,
+        and not a repeat within the same period). A sentence another period
+        also says is kept, since it applies to this period too.
+        """
+        lines = []
+        for period in periods:
+            fields = [f"{period.get('temperatureF')}°F"]
+            if period.get('precipitationChance') is not None:
+                fields.append(f"rain {period['precipitationChance']}%")
+            wind = ' '.join(filter(None, [period.get('windDirection'), period.get('windSpeed')]))
+            if wind:
+                fields.append(wind)
+            short = period.get('shortForecast', '')
+            fields.append(short)
+            
+            repeated = self._field_sentences(period)
+            seen = set()
+            extra = []
+            for sentence in re.split(r'(?<=\.)\s+', period.get('detailedForecast', '')):
+                normalized = sentence.lower().strip(' .')
+                if not normalized or normalized in repeated or normalized in seen:
+                    continue
+                seen.add(normalized)
+                extra.append(sentence.strip())
+            
+            line = f"{period.get('name')}: {', '.join(fields)}"
+            if extra:
+                line += '. ' + ' '.join(extra)
+            lines.append(line)
+        return '\n'.join(lines)
+    
+    @staticmethod
+    def _period_weekday(period: Dict[str, Any]) -> str:
+        """Weekday of a period, including ones NWS names Today or This Afternoon"""
+        try:
+            return datetime.fromisoformat(period['startTime']).strftime('%A').lower()
+        except (KeyError, TypeError, ValueError):
+            return period.get('name', '').lower().split(' ')[0]
+    
+    def _relevant_periods(self, periods: List[Dict[str, Any]], question: str) -> List[Dict[str, Any]]:
+        """
+        Keep only the periods the question is about: every period for "this
+        week"/"next few days", or tonight/tomorrow/weekend/a weekday; otherwise
+        the first DEFAULT_PROMPT_PERIODS. Empty when the day asked about is not
+        in the forecast.
+        """
+        question = question.lower()
+        names = [period.get('name', '').lower() for period in periods]
+        weekdays = [self._period_weekday(period) for period in periods]
+        
+        if WEEK_RANGE.search(question):
+            return periods
+        if 'tonight' in question:
+            selected = [i for i, name in enumerate(names) if 'night' in name][:1]
+        elif 'tomorrow' in question:
+            # The day after the first night period
+            first_night = next((i for i, name in enumerate(names) if 'night' in name), 0)
+            selected = list(range(first_night + 1, min(first_night + 3, len(periods))))
+        elif 'weekend' in question:
+            selected = [i for i, day in enumerate(weekdays) if day in ('saturday', 'sunday')]
+        else:
+            days = [day for day in WEEKDAYS if day in question]
+            if not days:
+                return periods[:DEFAULT_PROMPT_PERIODS]
+            selected = [i for i, day in enumerate(weekdays) if day in days]
+        return [periods[i] for i in selected]
     
     def _format_mcp_result(self, mcp_result: Dict[str, Any]) -> str:
         """
@@ -241,6 +699,18 @@ Be conversational and helpful. If someone asks about weather, use the appropriat
         if 'error' in mcp_result:
             return f"Error: {mcp_result['error']}"
         
+        # Forecasts: compact structured encoding instead of the long text
+        structured = mcp_result.get('structuredContent') or {}
+        if structured.get('periods'):
+            return self._compact_forecast(structured['periods'])
+        if structured.get('locations') and all('periods' in loc or 'error' in loc for loc in structured['locations']):
+            return '\n'.join(
+                f"({loc['latitude']}, {loc['longitude']}):\n" + (
+                    f"Error: {loc['error']}" if 'error' in loc else self._compact_forecast(loc['periods'])
+                )
+                for loc in structured['locations']
+            )
+        
         # Extract content from MCP response
         content = mcp_result.get('content', [])
         if isinstance(content, list) and len(content) > 0:
@@ -250,6 +720,20 @@ Be conversational and helpful. If someone asks about weather, use the appropriat
     
     async def _handle_city_weather(self, user_message: str) -> str:
         """Handle city weather requests"""
+        city, weather_data = await self._fetch_city_weather(user_message)
+        if city is None:
+            return weather_data
+        
+        # Now use Gemini to provide an intelligent response based on the weather data
+        return await self._generate_intelligent_response(user_message, city, weather_data)
+    
+    async def _fetch_city_weather(self, user_message: str) -> Tuple[Optional[str], str]:
+        """
+        Find the city in the message and get its forecast
+        
+        Returns:
+            (city, weather_data), or (None, message for the user) when that fails
+        """
         # City coordinates mapping
         city_coords = {
             'houston': {'latitude': 29.7604, 'longitude': -95.3698},
@@ -273,32 +757,34 @@ Be conversational and helpful. If someone asks about weather, use the appropriat
             coords = city_coords[found_city]
             print(f'🔧 Getting weather for {found_city.title()}')
             
-            # Call MCP tool directly
-            result = await self.mcp_client.call_mcp_tool('get_forecast', coords)
+            # Call MCP tool directly; the whole week, so questions about later days can be answered
+            result = await self.mcp_client.call_mcp_tool('get_forecast', {**coords, 'periods': CITY_FORECAST_PERIODS})
             
             if 'error' in result:
-                return f"❌ Sorry, I couldn't get weather data for {found_city.title()}: {result['error']}"
-            
-            # Get raw weather data
-            weather_data = self._format_mcp_result(result)
+                return None, f"❌ Sorry, I couldn't get weather data for {found_city.title()}: {result['error']}"
             
-            # Now use Gemini to provide an intelligent response based on the weather data
-            return await self._generate_intelligent_response(user_message, found_city, weather_data)
-        
-        return "❌ I couldn't identify the city you're asking about."
+            # Only the periods the question is about, compactly encoded
+            periods = (result.get('structuredContent') or {}).get('periods')
+            if periods:
+                relevant = self._relevant_periods(periods, user_message)
+                if not relevant:
+                    # Say so instead of passing off another day's forecast as the one asked about
+                    return found_city, (
+                        f"No forecast is available for the day asked about; the forecast only covers "
+                        f"{periods[0].get('name')} through {periods[-1].get('name')}."
+                    )
+                return found_city, self._compact_forecast(relevant)
+            return found_city, self._format_mcp_result(result)
+        
+        return None, "❌ I couldn't identify the city you're asking about."
     
     async def _handle_weather_alerts(self, user_message: str) -> str:
         """Handle weather alerts requests"""
         # Extract state if mentioned
-        states = {
-            'california': 'CA', 'texas': 'TX', 'florida': 'FL', 'new york': 'NY',
-            'illinois': 'IL', 'washington': 'WA', 'arizona': 'AZ'
-        }
-        
         user_lower = user_message.lower()
         found_state = None
         
-        for state_name, state_code in states.items():
+        for state_name, state_code in ALERT_STATES.items():
             if state_name in user_lower or state_code.lower() in user_lower:
                 found_state = state_code
                 break
@@ -315,10 +801,9 @@ Be conversational and helpful. If someone asks about weather, use the appropriat
         
         return "❌ Please specify a US state for weather alerts (e.g., 'California', 'Texas', 'CA', 'TX')"
     
-    async def _generate_intelligent_response(self, user_question: str, city: str, weather_data: str) -> str:
-        """Generate intelligent response using Gemini based on weather data and user question"""
-        try:
-            prompt = f"""
+    def _intelligent_prompt(self, user_question: str, city: str, weather_data: str) -> str:
+        """Prompt asking Gemini to answer the question from the forecast"""
+        return f"""
 You are a helpful and friendly weather assistant. A user asked: "{user_question}"
 
 I have retrieved the current weather forecast for {city.title()}:
@@ -338,8 +823,19 @@ Guidelines:
 
 Answer their specific question, don't just repeat the weather data.
 """
-            
-            response = self.model.generate_content(prompt)
+    
+    async def _generate_intelligent_response(self, user_question: str, city: str, weather_data: str) -> str:
+        """Generate intelligent response using Gemini based on weather data and user question"""
+        cache_key = self.answer_cache.key(user_question, city, weather_data)
+        cached = self.answer_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            prompt = self._intelligent_prompt(user_question, city, weather_data)
+            response = await self._generate(self.model, prompt)
+            # Only real answers are cached, never the fallback below
+            self.answer_cache.put(cache_key, response.text)
             return response.text
             
         except Exception as e:
@@ -347,15 +843,19 @@ Answer their specific question, don't just repeat the weather data.
             # Fallback to basic response with weather data
             return f"🌤️ Here's the weather for {city.title()}:\n\n{weather_data}"
 
-    async def _generate_simple_response(self, user_message: str) -> str:
-        """Generate a simple Gemini response without tools"""
-        try:
-            response = self.model.generate_content(f"""
+    def _simple_prompt(self, user_message: str) -> str:
+        """Prompt for questions not tied to a known city or state"""
+        return f"""
 You are a helpful weather assistant. The user asked: "{user_message}"
 
 Provide a helpful response about weather. If they're asking about a specific location, 
 suggest they be more specific about US cities or states. Keep it friendly and conversational.
-""")
+"""
+    
+    async def _generate_simple_response(self, user_message: str) -> str:
+        """Generate a simple Gemini response without tools"""
+        try:
+            response = await self._generate(self.model, self._simple_prompt(user_message))
             return response.text
         except Exception as e:
             return f"I understand you're asking about weather. Could you be more specific about which US city or state you're interested in?"
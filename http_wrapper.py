@@ -6,17 +6,24 @@ HTTP wrapper for MCP Weather Server to make it compatible with TestSprite
 from flask import Flask, request, jsonify
 import asyncio
 import subprocess
-import json
 import sys
 import os
+import queue
 from threading import Thread
-import time
+from client import StderrForwarder, OUTBOUND_QUEUE_SIZE, encode_frame, decode_frame
 
 app = Flask(__name__)
 
+# Seconds a freshly spawned server gets to answer initialize
+STARTUP_TIMEOUT = float(os.getenv('MCP_STARTUP_TIMEOUT', '10'))
+
+# Seconds a request may wait for room in the outbound queue
+SEND_TIMEOUT = float(os.getenv('MCP_SEND_TIMEOUT', '30'))
+
 class MCPServerWrapper:
     def __init__(self):
         self.process = None
+        self._outbound = queue.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
         self.setup_server()
     
     def setup_server(self):
@@ -30,13 +37,14 @@ class MCPServerWrapper:
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                cwd=server_dir,
-                bufsize=0
+                cwd=server_dir
             )
             
-            # Initialize MCP connection
-            time.sleep(0.5)
+            # Keep stderr flowing (a full pipe stalls the server) and give stdin a single writer
+            Thread(target=self._drain_stderr, args=(self.process,), daemon=True).start()
+            Thread(target=self._write_loop, args=(self.process,), daemon=True).start()
+            
+            # Initialize right away: the request waits in the pipe until the server is ready
             init_message = {
                 "jsonrpc": "2.0",
                 "id": 1,
@@ -49,7 +57,7 @@ class MCPServerWrapper:
             }
             
             self.send_message(init_message)
-            response = self.receive_message()
+            response = self.receive_message(timeout=STARTUP_TIMEOUT)
             
             if not response.get('error'):
                 # Send initialized notification
@@ -62,25 +70,58 @@ class MCPServerWrapper:
             else:
                 print(f"❌ MCP Server initialization failed: {response.get('error')}")
                 
+        except TimeoutError as e:
+            print(f"❌ Failed to setup MCP server: {e}")
+            self.process.kill()
         except Exception as e:
             print(f"❌ Failed to setup MCP server: {e}")
     
+    def _drain_stderr(self, process):
+        forwarder = StderrForwarder()
+        for line in process.stderr:
+            forwarder.forward(line.decode(errors='replace'))
+    
+    def _write_loop(self, process):
+        try:
+            while True:
+                frame = self._outbound.get()
+                process.stdin.write(frame)
+                process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            # Server exited or stdin was closed
+            pass
+    
     def send_message(self, message):
         if self.process and self.process.stdin:
-            json_str = json.dumps(message) + '\n'
-            self.process.stdin.write(json_str)
-            self.process.stdin.flush()
+            try:
+                self._outbound.put(encode_frame(message), timeout=SEND_TIMEOUT)
+            except queue.Full:
+                raise TimeoutError("MCP server is not reading requests")
+    
+    def receive_message(self, timeout=None):
+        if timeout is None:
+            return self._read_message()
+        
+        # readline() has no timeout, so wait for it on a helper thread
+        result = {}
+        reader = Thread(target=lambda: result.update(self._read_message()), daemon=True)
+        reader.start()
+        reader.join(timeout)
+        if reader.is_alive():
+            raise TimeoutError(f"No response from MCP server within {timeout}s")
+        return result
     
-    def receive_message(self):
-        if self.process and self.process.stdout:
-            line = self.process.stdout.readline()
-            if line:
-                line = line.strip()
-                if line.startswith('{'):
-                    try:
-                        return json.loads(line)
-                    except json.JSONDecodeError:
-                        return {}
+    def _read_message(self):
+        if not (self.process and self.process.stdout):
+            return {}
+        # Skip log lines until the next JSON frame (or EOF)
+        for line in iter(self.process.stdout.readline, b''):
+            try:
+                message = decode_frame(line)
+            except ValueError:
+                return {}
+            if message is not None:
+                return message
         return {}
     
     def call_tool(self, tool_name, arguments):
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Load test for the web_app.py /chat endpoint.
+
+Fires N chat requests at once and prints when each one started and finished.
+Requests are overlapping when the wall time is close to the slowest single
+request. If Gemini calls block the event loop, wall time approaches the sum
+of all request times instead.
+
+Each request gets its own message ("... (request #3)"), so the Gemini answer
+cache cannot serve it. Forecasts still come from the tool-result cache within
+its TTL; start web_app.py with MCP_RESULT_CACHE=false to load the weather
+server as well.
+
+Usage:
+    python web_app.py &                      # or: uvicorn web_app:app
+    python load_test_chat.py                 # 8 concurrent requests
+    python load_test_chat.py -n 20 --url http://127.0.0.1:8000 \\
+        --message "Should I take an umbrella in Seattle?"
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+async def send(client: httpx.AsyncClient, url: str, message: str, start: float, index: int):
+    sent = time.perf_counter() - start
+    # A unique question per request, so no answer is served from the Gemini answer cache
+    response = await client.post(f"{url}/chat", json={"message": f"{message} (request #{index})"})
+    done = time.perf_counter() - start
+    ok = response.status_code == 200 and response.json().get("success")
+    return index, sent, done, ok
+
+async def run(url: str, count: int, message: str):
+    async with httpx.AsyncClient(timeout=None, limits=httpx.Limits(max_connections=count)) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(send(client, url, message, start, i) for i in range(count)))
+        wall = time.perf_counter() - start
+
+    durations = []
+    for index, sent, done, ok in sorted(results, key=lambda r: r[2]):
+        durations.append(done - sent)
+        print(f"#{index:<3} start {sent:6.2f}s  end {done:6.2f}s  took {done - sent:6.2f}s  {'✅' if ok else '❌'}")
+
+    print(f"\n⏱️ wall {wall:.2f}s, slowest {max(durations):.2f}s, sum {sum(durations):.2f}s")
+    # 1.0 means fully serialized; close to N means all requests ran at the same time
+    print(f"🔀 overlap factor {sum(durations) / wall:.1f}x of {count}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--requests", type=int, default=8, help="concurrent /chat requests")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="web_app.py base URL")
+    parser.add_argument("--message", default="What's the weather like in Chicago today?", help="chat message to send")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.message))
+
+if __name__ == "__main__":
+    main()
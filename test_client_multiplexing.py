@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for JSON-RPC id multiplexing in client.MCPClient (_request/_dispatch)
+
+The weather server is replaced by an in-memory pipe, so replies can be
+sent in any order, late, or not at all.
+
+Usage:
+    python -m pytest test_client_multiplexing.py
+    python test_client_multiplexing.py
+"""
+
+import asyncio
+import os
+import sys
+
+os.environ.setdefault('MCP_TOOLS_CACHE_ENABLED', 'false')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from client import MCPClient, decode_frame, encode_frame  # noqa: E402
+
+class FakeProcess:
+    def __init__(self):
+        self.returncode = None
+        self.stdout = asyncio.StreamReader()
+
+class FakePipe:
+    """Stands in for a spawned weather.py: collects what the client writes
+    and lets the test write replies back in any order."""
+
+    def __init__(self, client: MCPClient):
+        self.client = client
+        self.sent = []
+        self._received = asyncio.Condition()
+        client.process = FakeProcess()
+        client._outbound = asyncio.Queue()
+        client._writer_task = asyncio.create_task(self._write_loop())
+        client._reader_task = asyncio.create_task(client._read_loop())
+
+    async def _write_loop(self):
+        while True:
+            data = await self.client._outbound.get()
+            async with self._received:
+                for line in data.splitlines():
+                    self.sent.append(decode_frame(line))
+                self._received.notify_all()
+
+    async def wait_sent(self, count: int):
+        async with self._received:
+            await self._received.wait_for(lambda: len(self.sent) >= count)
+
+    def reply(self, message):
+        self.client.process.stdout.feed_data(encode_frame(message))
+
+    def close(self):
+        self.client.process.stdout.feed_eof()
+        self.client._writer_task.cancel()
+
+def run(scenario):
+    async def wrapper():
+        client = MCPClient(cache_results=False)
+        pipe = FakePipe(client)
+        try:
+            return await scenario(client, pipe)
+        finally:
+            pipe.close()
+    return asyncio.run(wrapper())
+
+def test_out_of_order_replies_reach_their_callers():
+    async def scenario(client, pipe):
+        calls = [asyncio.create_task(client._request('tools/call', {'n': n})) for n in range(3)]
+        await pipe.wait_sent(3)
+        ids = [message['id'] for message in pipe.sent]
+        assert len(set(ids)) == 3
+        for message in reversed(pipe.sent):
+            pipe.reply({'jsonrpc': '2.0', 'id': message['id'], 'result': {'n': message['params']['n']}})
+        results = await asyncio.gather(*calls)
+        assert [result['result']['n'] for result in results] == [0, 1, 2]
+        assert client.in_flight == 0
+    run(scenario)
+
+def test_noise_lines_are_skipped():
+    async def scenario(client, pipe):
+        calls = [asyncio.create_task(client._request('tools/list')) for _ in range(2)]
+        await pipe.wait_sent(2)
+        client.process.stdout.feed_data(b'INFO server starting\n')
+        client.process.stdout.feed_data(b'{not json\n')
+        for message in pipe.sent:
+            pipe.reply({'jsonrpc': '2.0', 'id': message['id'], 'result': {}})
+        results = await asyncio.gather(*calls)
+        assert [result['id'] for result in results] == [message['id'] for message in pipe.sent]
+    run(scenario)
+
+def test_timeout_cancels_and_late_reply_is_dropped():
+    async def scenario(client, pipe):
+        try:
+            await client._request('tools/call', {'name': 'slow'}, timeout=0.05)
+        except TimeoutError:
+            pass
+        else:
+            raise AssertionError('expected a timeout')
+        await pipe.wait_sent(2)
+        request, cancel = pipe.sent
+        assert cancel['method'] == 'notifications/cancelled'
+        assert cancel['params']['requestId'] == request['id']
+        assert client.in_flight == 0
+
+        # A late reply for the abandoned id must not disturb the next call
+        pipe.reply({'jsonrpc': '2.0', 'id': request['id'], 'result': {'late': True}})
+        call = asyncio.create_task(client._request('tools/list'))
+        await pipe.wait_sent(3)
+        pipe.reply({'jsonrpc': '2.0', 'id': pipe.sent[2]['id'], 'result': {'late': False}})
+        assert (await call)['result'] == {'late': False}
+    run(scenario)
+
+def test_server_requests_and_notifications():
+    async def scenario(client, pipe):
+        seen = []
+        client.on_notification('notifications/message', seen.append)
+        pipe.reply({'jsonrpc': '2.0', 'id': 'srv-1', 'method': 'ping'})
+        pipe.reply({'jsonrpc': '2.0', 'id': 'srv-2', 'method': 'sampling/createMessage'})
+        pipe.reply({'jsonrpc': '2.0', 'method': 'notifications/message', 'params': {'data': 'hi'}})
+        await pipe.wait_sent(2)
+        replies = {message['id']: message for message in pipe.sent}
+        assert replies['srv-1']['result'] == {}
+        assert replies['srv-2']['error']['code'] == -32601
+        assert seen == [{'data': 'hi'}]
+    run(scenario)
+
+def test_codec_errors_surface_as_value_error():
+    import client
+
+    class DecodeError(Exception):
+        """Like msgspec.DecodeError, not a ValueError subclass"""
+
+    def decode(line):
+        raise DecodeError('malformed')
+
+    original = client.decode_message
+    client.decode_message = decode
+    try:
+        client.decode_frame(b'{"jsonrpc": ')
+    except ValueError as error:
+        assert isinstance(error.__cause__, DecodeError)
+    else:
+        raise AssertionError('expected ValueError')
+    finally:
+        client.decode_message = original
+
+def test_request_many_pipelines_requests():
+    async def scenario(client, pipe):
+        call = asyncio.create_task(client._request_many(
+            [('tools/call', {'n': 0}), ('tools/call', {'n': 1}), ('tools/call', {'n': 2})], timeout=0.5
+        ))
+        await pipe.wait_sent(3)
+        assert all(isinstance(message, dict) for message in pipe.sent)
+        first, second, _ = pipe.sent
+        pipe.reply({'jsonrpc': '2.0', 'id': second['id'], 'error': {'code': -32603, 'message': 'boom'}})
+        pipe.reply({'jsonrpc': '2.0', 'id': first['id'], 'result': {'n': 0}})
+        replies = await call
+        assert replies[0]['result'] == {'n': 0}
+        assert replies[1]['error']['message'] == 'boom'
+        # The third got no reply and times out on its own
+        assert isinstance(replies[2], TimeoutError)
+    run(scenario)
+
+def test_eof_fails_every_pending_call():
+    async def scenario(client, pipe):
+        calls = [asyncio.create_task(client._request('tools/call')) for _ in range(3)]
+        await pipe.wait_sent(3)
+        client.process.stdout.feed_eof()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert not client.is_alive
+    run(scenario)
+
+if __name__ == '__main__':
+    tests = [(name, func) for name, func in globals().items() if name.startswith('test_')]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f'✅ {name}')
+        except Exception as e:
+            failed += 1
+            print(f'❌ {name}: {e!r}')
+    print(f'\n🎯 {len(tests) - failed}/{len(tests)} tests passed')
+    sys.exit(1 if failed else 0)
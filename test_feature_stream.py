@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming GeoJSON parser used for NWS alert payloads
+(FeatureStreamParser and read_features in weather-server-python/weather.py)
+
+Usage:
+    python -m pytest test_feature_stream.py
+    python test_feature_stream.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+import httpx
+
+os.environ.setdefault("NWS_POINTS_CACHE", os.path.join(tempfile.mkdtemp(), "points_cache.sqlite3"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather-server-python"))
+import weather  # noqa: E402
+
+PAYLOAD = json.dumps({
+    "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld", {"@version": "1.1"}],
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "id": "urn:oid:1",
+            "geometry": {"type": "Polygon", "coordinates": [[[-97.1, 32.5], [-97.0, 32.6]]]},
+            "properties": {"event": "Flood Warning", "severity": "Severe", "areaDesc": "Dallas, TX",
+                           "description": "Braces {inside} strings, \"quotes\" and ]brackets[ are fine."}
+        },
+        {
+            "id": "urn:oid:2",
+            "geometry": None,
+            "properties": {"event": "Heat Advisory", "severity": "Moderate", "areaDesc": "Zavala, TX",
+                           "description": "Heat index values up to 110. Sıcak hava uyarısı ☀"}
+        }
+    ],
+    "title": "Current watches, warnings, and advisories",
+    "updated": "2026-10-17T06:00:00+00:00",
+    "pagination": {"next": "https://api.weather.gov/alerts?cursor=abc"}
+})
+
+def parse_in_chunks(text, size):
+    parser = weather.FeatureStreamParser()
+    features = []
+    for i in range(0, len(text), size):
+        features.extend(parser.feed(text[i:i + size]))
+    features.extend(parser.feed("", final=True))
+    return parser, features
+
+def test_whole_payload():
+    parser, features = parse_in_chunks(PAYLOAD, len(PAYLOAD))
+    assert parser.saw_features
+    assert features == json.loads(PAYLOAD)["features"]
+
+def test_every_chunk_size_gives_the_same_features():
+    expected = json.loads(PAYLOAD)["features"]
+    for size in range(1, 64):
+        _, features = parse_in_chunks(PAYLOAD, size)
+        assert features == expected, f"chunk size {size}"
+
+def test_numbers_split_across_chunks():
+    text = '{"count": 12345, "features": [{"n": 1.25e3}], "z": 7}'
+    for size in range(1, len(text)):
+        _, features = parse_in_chunks(text, size)
+        assert features == [{"n": 1250.0}], f"chunk size {size}"
+
+def test_features_emitted_as_soon_as_complete():
+    parser = weather.FeatureStreamParser()
+    assert parser.feed('{"features": [{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(': 2}]}') == [{"b": 2}]
+    assert parser.feed("", final=True) == []
+
+def test_payload_without_features():
+    parser, features = parse_in_chunks('{"title": "none", "features": []}', 5)
+    assert parser.saw_features and features == []
+    parser, features = parse_in_chunks('{"detail": "Not found", "status": 404}', 5)
+    assert not parser.saw_features and features == []
+
+def test_malformed_payloads_raise_value_error():
+    for text in ('[1, 2]', '{"features": {"a": 1}}', '{"a" 1}', '{"features": [{"a": 1}'):
+        try:
+            parse_in_chunks(text, 4)
+        except ValueError:
+            continue
+        raise AssertionError(f"no error for {text!r}")
+
+def test_read_features_keeps_only_requested_fields():
+    body = PAYLOAD.encode()
+
+    async def chunks():
+        # Odd chunk size so multi-byte UTF-8 characters get split
+        for i in range(0, len(body), 7):
+            yield body[i:i + 7]
+
+    async def scenario():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=chunks()))
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "https://api.weather.gov/alerts/active") as response:
+                return await weather.read_features(response, ("event", "description"))
+
+    data = asyncio.run(scenario())
+    assert data == {"features": [
+        {"properties": {"event": "Flood Warning",
+                        "description": "Braces {inside} strings, \"quotes\" and ]brackets[ are fine."}},
+        {"properties": {"event": "Heat Advisory",
+                        "description": "Heat index values up to 110. Sıcak hava uyarısı ☀"}}
+    ]}
+
+if __name__ == "__main__":
+    tests = [(name, func) for name, func in globals().items() if name.startswith("test_")]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {name}: {e!r}")
+    print(f"\n🎯 {len(tests) - failed}/{len(tests)} tests passed")
+    sys.exit(1 if failed else 0)
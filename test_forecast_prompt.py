@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact forecast prompt in gemini_client.py
+(_relevant_periods, _compact_forecast and _field_sentences)
+
+Skipped when google-generativeai is not installed.
+
+Usage:
+    python -m pytest test_forecast_prompt.py
+    python test_forecast_prompt.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+try:
+    from gemini_client import GeminiMCPClient  # noqa: E402
+except ImportError as e:
+    import pytest
+    pytest.skip(f"gemini_client needs {e.name}", allow_module_level=True)
+
+WIND_CHILL = "Wind chill values as low as 20."
+
+def period(name, start, temperature, short, detail, wind="10 mph", direction="NW", rain=None):
+    return {
+        "name": name, "startTime": start, "temperatureF": temperature,
+        "windSpeed": wind, "windDirection": direction, "precipitationChance": rain,
+        "shortForecast": short, "detailedForecast": detail
+    }
+
+# Friday afternoon through Tuesday, as NWS names the periods
+FORECAST = [
+    period("This Afternoon", "2026-10-16T14:00:00-05:00", 45, "Sunny",
+           "Sunny, with a high near 45. Northwest wind around 10 mph."),
+    period("Tonight", "2026-10-16T18:00:00-05:00", 28, "Patchy Fog",
+           f"Patchy fog after 3am. Otherwise, mostly clear, with a low around 28. {WIND_CHILL}"),
+    period("Saturday", "2026-10-17T06:00:00-05:00", 40, "Partly Sunny",
+           f"Partly sunny, with a high near 40. {WIND_CHILL} Northwest wind 10 mph."),
+    period("Saturday Night", "2026-10-17T18:00:00-05:00", 30, "Rain",
+           f"Rain. Low around 30. {WIND_CHILL} Chance of precipitation is 80%. Gusts as high as 25 mph.",
+           rain=80),
+    period("Sunday", "2026-10-18T06:00:00-05:00", 42, "Mostly Sunny",
+           "Mostly sunny, with a high near 42."),
+    period("Sunday Night", "2026-10-18T18:00:00-05:00", 31, "Mostly Clear",
+           "Mostly clear, with a low around 31."),
+    period("Monday", "2026-10-19T06:00:00-05:00", 48, "Sunny",
+           "Sunny, with a high near 48."),
+    period("Monday Night", "2026-10-19T18:00:00-05:00", 33, "Clear",
+           "Clear, with a low around 33."),
+]
+
+SELECTIONS = [
+    ("Is it cold tonight in Chicago?", ["Tonight"]),
+    ("Do I need an umbrella tomorrow?", ["Saturday", "Saturday Night"]),
+    ("How is the weekend looking?", ["Saturday", "Saturday Night", "Sunday", "Sunday Night"]),
+    ("Can I run on Monday?", ["Monday", "Monday Night"]),
+    ("What about this week?", [p["name"] for p in FORECAST]),
+    ("Any rain in the next few days?", [p["name"] for p in FORECAST]),
+    ("Will it rain later?", [p["name"] for p in FORECAST]),
+    ("What's the weather in Chicago?", ["This Afternoon", "Tonight", "Saturday", "Saturday Night", "Sunday"]),
+    ("Is Thursday going to be warm?", []),
+]
+
+def client():
+    # The prompt helpers need no model or MCP connection
+    return GeminiMCPClient.__new__(GeminiMCPClient)
+
+def test_relevant_periods():
+    for question, expected in SELECTIONS:
+        selected = client()._relevant_periods(FORECAST, question)
+        assert [p["name"] for p in selected] == expected, question
+
+def test_field_sentences():
+    sentences = GeminiMCPClient._field_sentences(FORECAST[0])
+    assert "sunny, with a high near 45" in sentences
+    assert "northwest wind around 10 mph" in sentences
+    assert "sunny" in sentences
+
+def test_compact_forecast_drops_only_restated_fields():
+    lines = client()._compact_forecast(FORECAST[:4]).splitlines()
+    assert lines[0] == "This Afternoon: 45°F, NW 10 mph, Sunny"
+    assert lines[2].startswith("Saturday: 40°F, NW 10 mph, Partly Sunny. ")
+    assert "high near 40" not in lines[2] and "Northwest wind" not in lines[2]
+    # Sentences that add something are kept, fog and gusts included
+    assert "Patchy fog after 3am." in lines[1]
+    assert "Gusts as high as 25 mph." in lines[3]
+    assert "Chance of precipitation" not in lines[3]
+
+def test_compact_forecast_keeps_repeats_across_periods():
+    lines = client()._compact_forecast(FORECAST[1:4]).splitlines()
+    assert all(WIND_CHILL in line for line in lines)
+    # but says it once within a period
+    doubled = dict(FORECAST[4], detailedForecast=f"{WIND_CHILL} {WIND_CHILL}")
+    assert client()._compact_forecast([doubled]).count(WIND_CHILL) == 1
+
+if __name__ == "__main__":
+    tests = [(name, func) for name, func in globals().items() if name.startswith("test_")]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {name}: {e!r}")
+    print(f"\n🎯 {len(tests) - failed}/{len(tests)} tests passed")
+    sys.exit(1 if failed else 0)
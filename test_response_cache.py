@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP-aware NWS response cache in weather-server-python/weather.py
+
+Runs without network access: NWS is replaced by an httpx.MockTransport.
+
+Usage:
+    python -m pytest test_response_cache.py
+    python test_response_cache.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+import httpx
+
+os.environ.setdefault("NWS_POINTS_CACHE", os.path.join(tempfile.mkdtemp(), "points_cache.sqlite3"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather-server-python"))
+import weather  # noqa: E402
+
+FORECAST_URL = f"{weather.NWS_API_BASE}/gridpoints/OKX/33,35/forecast"
+
+def use_mock_nws(handler):
+    """Point the shared NWS client at ``handler`` and start from an empty cache."""
+    weather._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    weather.response_cache = weather.ResponseCache(weather.NWS_CACHE_MAX_ENTRIES)
+    weather._inflight_requests.clear()
+
+def test_freshness_lifetime_max_age():
+    assert weather.freshness_lifetime({"Cache-Control": "public, max-age=300"}) == 300
+    # s-maxage wins over max-age for a shared cache
+    assert weather.freshness_lifetime({"Cache-Control": "max-age=60, s-maxage=120"}) == 120
+    # Time already spent in upstream caches is subtracted
+    assert weather.freshness_lifetime({"Cache-Control": "max-age=300", "Age": "100"}) == 200
+    assert weather.freshness_lifetime({"Cache-Control": "max-age=30", "Age": "100"}) == 0
+
+def test_freshness_lifetime_no_store_and_no_cache():
+    assert weather.freshness_lifetime({"Cache-Control": "no-store"}) is None
+    assert weather.freshness_lifetime({"Cache-Control": "no-cache, max-age=300"}) == 0
+    assert weather.freshness_lifetime({}) == 0
+
+def test_freshness_lifetime_expires():
+    headers = {
+        "Date": "Sat, 17 Oct 2026 12:00:00 GMT",
+        "Expires": "Sat, 17 Oct 2026 12:05:00 GMT"
+    }
+    assert weather.freshness_lifetime(headers) == 300
+    # An unparseable Expires means already stale
+    assert weather.freshness_lifetime({"Expires": "0"}) == 0
+
+def test_store_skips_unusable_responses():
+    cache = weather.ResponseCache(max_entries=4)
+    cache.store("a", {"n": 1}, {"Cache-Control": "no-store"})
+    cache.store("b", {"n": 2}, {"Cache-Control": "max-age=0"})
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+
+    # Stale but revalidatable entries are kept
+    cache.store("c", {"n": 3}, {"Cache-Control": "max-age=0", "ETag": '"v1"'})
+    entry = cache.get("c")
+    assert entry is not None and not entry.is_fresh()
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+
+def test_lru_eviction():
+    cache = weather.ResponseCache(max_entries=2)
+    headers = {"Cache-Control": "max-age=60"}
+    cache.store("a", {}, headers)
+    cache.store("b", {}, headers)
+    cache.get("a")  # "b" is now least recently used
+    cache.store("c", {}, headers)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+def test_fresh_entry_served_from_memory():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"n": len(requests)}, headers={"Cache-Control": "max-age=300"})
+
+    async def scenario():
+        use_mock_nws(handler)
+        first = await weather.make_nws_request(FORECAST_URL)
+        second = await weather.make_nws_request(FORECAST_URL)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first == second == {"n": 1}
+    assert len(requests) == 1
+    assert weather.response_cache.hits == 1
+
+def test_stale_entry_revalidated_with_conditional_get():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"Cache-Control": "max-age=300"})
+        return httpx.Response(200, json={"forecast": "sunny"}, headers={"ETag": '"v1"', "Cache-Control": "max-age=0"})
+
+    async def scenario():
+        use_mock_nws(handler)
+        first = await weather.make_nws_request(FORECAST_URL)
+        second = await weather.make_nws_request(FORECAST_URL)
+        third = await weather.make_nws_request(FORECAST_URL)
+        return first, second, third
+
+    results = asyncio.run(scenario())
+    assert all(result == {"forecast": "sunny"} for result in results)
+    # Full fetch, then a 304 that makes the entry fresh again, then a cache hit
+    assert len(requests) == 2
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+def test_stale_entry_served_when_nws_fails():
+    status = {"code": 200}
+
+    def handler(request):
+        if status["code"] != 200:
+            return httpx.Response(status["code"])
+        return httpx.Response(200, json={"forecast": "rain"}, headers={"ETag": '"v1"', "Cache-Control": "max-age=0"})
+
+    async def scenario():
+        use_mock_nws(handler)
+        await weather.make_nws_request(FORECAST_URL)
+        status["code"] = 400
+        return await weather.make_nws_request(FORECAST_URL)
+
+    assert asyncio.run(scenario()) == {"forecast": "rain"}
+    assert weather.response_cache.stale_served == 1
+
+if __name__ == "__main__":
+    tests = [(name, func) for name, func in globals().items() if name.startswith("test_")]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {name}: {e!r}")
+    print(f"\n🎯 {len(tests) - failed}/{len(tests)} tests passed")
+    sys.exit(1 if failed else 0)
@@ -15,18 +15,21 @@ load_dotenv()
 app = Flask(__name__)
 gemini_client = None
 
+# The MCP connection lives on this loop, so every request must run on it too
+loop = asyncio.new_event_loop()
+
 def init_gemini():
-    global gemini_client
-    loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     
     async def setup():
         global gemini_client
-        gemini_client = GeminiMCPClient()
-        await gemini_client.connect()
+        client = GeminiMCPClient()
+        await client.connect()
+        gemini_client = client
         print("✅ Gemini ready!")
     
-    loop.run_until_complete(setup())
+    loop.create_task(setup())
+    loop.run_forever()
 
 # Start Gemini in background
 if os.getenv('GOOGLE_AI_API_KEY'):
@@ -133,11 +136,9 @@ def ask():
         if not gemini_client:
             return jsonify({'answer': '⏳ Starting up... please wait and try again in a moment.'})
         
-        # Get answer
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        answer = loop.run_until_complete(gemini_client.chat_with_weather(question))
-        loop.close()
+        # Get answer on the background loop that owns the MCP connection
+        future = asyncio.run_coroutine_threadsafe(gemini_client.chat_with_weather(question), loop)
+        answer = future.result()
         
         return jsonify({'answer': answer})
         
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for parsing large NWS alert payloads.
+
+Compares peak Python memory of the old path (response.json() on the whole
+body, then format every alert) against the streaming path used by
+get_alerts (features parsed incrementally, only rendered fields kept).
+
+Usage:
+    # Record a real payload once, then benchmark against it
+    curl -H "User-Agent: weather-app/1.0" https://api.weather.gov/alerts/active -o alerts.json
+    python bench_alerts_memory.py alerts.json
+
+    # Without a file a synthetic payload shaped like /alerts/active is used
+    python bench_alerts_memory.py --features 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tracemalloc
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import weather  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+def synthetic_payload(count: int) -> bytes:
+    """Build an /alerts/active-like FeatureCollection with ``count`` alerts."""
+    features = []
+    for i in range(count):
+        features.append({
+            "id": f"https://api.weather.gov/alerts/urn:oid:2.49.0.1.840.0.{i}",
+            "type": "Feature",
+            # Polygons are a large share of real payloads and are never rendered
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[-97.0 + j * 0.01, 32.0 + j * 0.01] for j in range(60)]]
+            },
+            "properties": {
+                "id": f"urn:oid:2.49.0.1.840.0.{i}",
+                "areaDesc": "Dallas, TX; Tarrant, TX; Collin, TX",
+                "geocode": {"SAME": ["048113", "048439"], "UGC": ["TXZ119", "TXC439"]},
+                "affectedZones": [f"https://api.weather.gov/zones/forecast/TXZ{j:03d}" for j in range(20)],
+                "sent": "2026-10-17T06:00:00-05:00",
+                "status": "Actual",
+                "severity": "Severe",
+                "event": "Flood Warning",
+                "headline": "Flood Warning issued October 17 at 6:00AM CDT",
+                "description": "Flooding caused by excessive rainfall is expected. " * 20,
+                "instruction": "Turn around, don't drown when encountering flooded roads. " * 5,
+                "parameters": {"NWSheadline": ["FLOOD WARNING IN EFFECT"], "VTEC": ["/O.NEW.KFWD.FA.W.0042/"]}
+            }
+        })
+    return json.dumps({
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "type": "FeatureCollection",
+        "features": features,
+        "title": "Current watches, warnings, and advisories",
+        "updated": "2026-10-17T06:00:00+00:00"
+    }).encode()
+
+def make_client(payload: bytes) -> httpx.AsyncClient:
+    async def chunks():
+        for i in range(0, len(payload), CHUNK_SIZE):
+            yield payload[i:i + CHUNK_SIZE]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=chunks())
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+async def render_whole_body(payload: bytes) -> int:
+    async with make_client(payload) as client:
+        response = await client.get("https://api.weather.gov/alerts/active")
+        data = response.json()
+        return len("\n---\n".join(weather.format_alert(f) for f in data["features"]))
+
+async def render_streamed(payload: bytes) -> int:
+    async with make_client(payload) as client:
+        async with client.stream("GET", "https://api.weather.gov/alerts/active") as response:
+            data = await weather.read_features(response, weather.ALERT_FIELDS)
+        return len("\n---\n".join(weather.format_alert(f) for f in data["features"]))
+
+def measure(label: str, coro_factory, payload: bytes) -> None:
+    tracemalloc.start()
+    output_size = asyncio.run(coro_factory(payload))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<14} peak {peak / 1024 / 1024:8.2f} MiB  (rendered {output_size / 1024:.0f} KiB)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("payload", nargs="?", help="recorded /alerts/active JSON file")
+    parser.add_argument("--features", type=int, default=2000, help="synthetic alert count")
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload, "rb") as f:
+            payload = f.read()
+    else:
+        payload = synthetic_payload(args.features)
+
+    print(f"📦 Payload: {len(payload) / 1024 / 1024:.2f} MiB")
+    measure("response.json", render_whole_body, payload)
+    measure("streaming", render_streamed, payload)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the weather MCP server.
+
+Spawns weather.py over stdio the way MCPClient does, sends initialize as soon
+as the process exists and times each step up to the first tool response:
+
+    initialize   spawn -> initialize reply (interpreter start + imports)
+    tools/list   spawn -> tools/list reply
+    first call   spawn -> first tools/call reply
+
+Usage:
+    python bench_startup.py                 # 5 runs of get_alerts(state="CA")
+    python bench_startup.py --runs 20 --tool get_forecast \\
+        --args '{"latitude": 40.7128, "longitude": -74.006}'
+
+The first call hits the NWS API, so it includes network time; run without
+network access to see the local cost only (the tool then returns an error
+message quickly).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather.py")
+
+def request(process: subprocess.Popen, request_id: int, method: str, params: dict) -> dict:
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+    process.stdin.write(json.dumps(message).encode() + b"\n")
+    process.stdin.flush()
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"server exited before answering {method}")
+        if line.startswith(b"{"):
+            reply = json.loads(line)
+            if reply.get("id") == request_id:
+                return reply
+
+def run_once(tool: str, args: dict) -> dict[str, float]:
+    timings = {}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        cwd=os.path.dirname(SERVER_SCRIPT),
+    )
+    try:
+        request(process, 1, "initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "bench-startup", "version": "1.0.0"}
+        })
+        timings["initialize"] = time.perf_counter() - start
+        process.stdin.write(b'{"jsonrpc": "2.0", "method": "notifications/initialized"}\n')
+        process.stdin.flush()
+
+        request(process, 2, "tools/list", {})
+        timings["tools/list"] = time.perf_counter() - start
+
+        request(process, 3, "tools/call", {"name": tool, "arguments": args})
+        timings["first call"] = time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts to time")
+    parser.add_argument("--tool", default="get_alerts", help="tool to call first")
+    parser.add_argument("--args", default='{"state": "CA"}', help="tool arguments as JSON")
+    args = parser.parse_args()
+
+    results = [run_once(args.tool, json.loads(args.args)) for _ in range(args.runs)]
+
+    print(f"🚀 {args.runs} cold starts of weather.py ({sys.executable})")
+    for step in ("initialize", "tools/list", "first call"):
+        samples = [r[step] * 1000 for r in results]
+        print(f"{step:<12} median {statistics.median(samples):8.1f} ms   min {min(samples):8.1f} ms   max {max(samples):8.1f} ms")
+
+if __name__ == "__main__":
+    main()
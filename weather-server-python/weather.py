@@ -1,27 +1,789 @@
-from typing import Any
+import asyncio
+import codecs
+import importlib.util
+import json
+import os
+import random
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 import httpx
 from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult, TextContent
+from pydantic import BaseModel, Field
 
-# Initialize FastMCP server
-mcp = FastMCP("weather")
+if TYPE_CHECKING:
+    # Imported on first use instead, so a fresh server answers initialize sooner
+    import sqlite3
+
+    from starlette.applications import Starlette
 
 # Constants
 NWS_API_BASE = "https://api.weather.gov"
 USER_AGENT = "weather-app/1.0"
 
-async def make_nws_request(url: str) -> dict[str, Any] | None:
-    """Make a request to the NWS API with proper error handling."""
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "application/geo+json"
-    }
-    async with httpx.AsyncClient() as client:
+# Connection pool settings for the shared NWS client
+NWS_MAX_CONNECTIONS = int(os.getenv("NWS_MAX_CONNECTIONS", "20"))
+NWS_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("NWS_MAX_KEEPALIVE_CONNECTIONS", "10"))
+NWS_KEEPALIVE_EXPIRY = float(os.getenv("NWS_KEEPALIVE_EXPIRY", "30"))
+NWS_TIMEOUT = float(os.getenv("NWS_TIMEOUT", "30"))
+NWS_HTTP2 = os.getenv("NWS_HTTP2", "false").lower() == "true"
+
+# Tail-latency control for NWS fetches
+NWS_CALL_DEADLINE = float(os.getenv("NWS_CALL_DEADLINE", "15"))  # Total budget per tool call
+NWS_HEDGE_ENABLED = os.getenv("NWS_HEDGE", "true").lower() == "true"
+NWS_HEDGE_DELAY = float(os.getenv("NWS_HEDGE_DELAY", "1.0"))  # Used until enough latencies are observed
+NWS_HEDGE_PERCENTILE = float(os.getenv("NWS_HEDGE_PERCENTILE", "95"))
+NWS_MAX_RETRIES = int(os.getenv("NWS_MAX_RETRIES", "2"))
+NWS_RETRY_BACKOFF = float(os.getenv("NWS_RETRY_BACKOFF", "0.2"))  # Base of the jittered exponential backoff
+NWS_RETRY_BUDGET_RATIO = float(os.getenv("NWS_RETRY_BUDGET_RATIO", "0.1"))  # Extra attempts per request
+NWS_RETRY_BUDGET_MAX = float(os.getenv("NWS_RETRY_BUDGET_MAX", "10"))
+
+# Persistent points -> gridpoint cache
+POINTS_CACHE_PATH = os.getenv(
+    "NWS_POINTS_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "points_cache.sqlite3")
+)
+POINTS_CACHE_MAX_AGE = float(os.getenv("NWS_POINTS_CACHE_MAX_AGE", str(30 * 24 * 3600)))
+POINTS_PRECISION = 4  # NWS only resolves /points to four decimal places
+
+# Bulk forecast tool limits
+BULK_FORECAST_CONCURRENCY = int(os.getenv("NWS_BULK_CONCURRENCY", "8"))
+BULK_FORECAST_MAX_LOCATIONS = int(os.getenv("NWS_BULK_MAX_LOCATIONS", "50"))
+
+# National alerts snapshot
+ALERTS_SNAPSHOT_ENABLED = os.getenv("NWS_ALERTS_SNAPSHOT", "false").lower() == "true"
+ALERTS_REFRESH_INTERVAL = float(os.getenv("NWS_ALERTS_REFRESH_INTERVAL", "60"))
+# Fall back to per-state requests if the snapshot has not refreshed for this long
+ALERTS_SNAPSHOT_MAX_AGE = float(os.getenv("NWS_ALERTS_SNAPSHOT_MAX_AGE", str(5 * ALERTS_REFRESH_INTERVAL)))
+
+# Background cache warmer
+WARM_CACHE_ENABLED = os.getenv("NWS_WARM_CACHE", "false").lower() == "true"
+WARM_CITIES_FILE = os.getenv("NWS_WARM_CITIES")  # JSON: {"City": {"latitude": .., "longitude": ..}}
+WARM_SPACING = float(os.getenv("NWS_WARM_SPACING", "1.0"))  # Seconds between upstream warm-ups
+WARM_REFRESH_MARGIN = float(os.getenv("NWS_WARM_REFRESH_MARGIN", "60"))  # Refresh this long before expiry
+WARM_FALLBACK_INTERVAL = 600.0  # Used when NWS sends no cache lifetime
+WARM_RETRY_INTERVAL = 120.0
+
+# In-memory HTTP response cache
+NWS_CACHE_MAX_ENTRIES = int(os.getenv("NWS_CACHE_MAX_ENTRIES", "512"))
+
+# Listen address for `--transport streamable-http` (shared server for many hosts)
+MCP_HTTP_HOST = os.getenv("MCP_HTTP_HOST", "127.0.0.1")
+MCP_HTTP_PORT = int(os.getenv("MCP_HTTP_PORT", "8765"))
+
+_http_client: httpx.AsyncClient | None = None
+_lifespan_users = 0
+_background_tasks: list[asyncio.Task] = []
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared NWS client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        # HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+        http2 = NWS_HTTP2 and importlib.util.find_spec("h2") is not None
+        _http_client = httpx.AsyncClient(
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept": "application/geo+json"
+            },
+            limits=httpx.Limits(
+                max_connections=NWS_MAX_CONNECTIONS,
+                max_keepalive_connections=NWS_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=NWS_KEEPALIVE_EXPIRY
+            ),
+            timeout=NWS_TIMEOUT,
+            http2=http2
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    """Close the shared NWS client and release its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+class GridpointCache:
+    """SQLite-backed map from rounded coordinates to NWS gridpoint metadata.
+
+    The /points lookup for a location almost never changes, so entries
+    survive server restarts and are only refreshed after ``max_age`` seconds
+    or when explicitly invalidated.
+    """
+
+    def __init__(self, path: str, max_age: float):
+        self.path = path
+        self.max_age = max_age
+        self._conn: "sqlite3.Connection | None" = None
+
+    def _connect(self) -> "sqlite3.Connection":
+        if self._conn is None:
+            import sqlite3
+
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS gridpoints (
+                    location TEXT PRIMARY KEY,
+                    grid_id TEXT,
+                    grid_x INTEGER,
+                    grid_y INTEGER,
+                    forecast_url TEXT NOT NULL,
+                    forecast_hourly_url TEXT,
+                    stations_url TEXT,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def location_key(latitude: float, longitude: float) -> str:
+        """Round coordinates the same way NWS does for /points."""
+        return f"{round(latitude, POINTS_PRECISION)},{round(longitude, POINTS_PRECISION)}"
+
+    def get(self, latitude: float, longitude: float) -> dict[str, Any] | None:
+        """Return cached gridpoint metadata, or None if missing or expired."""
+        row = self._connect().execute(
+            "SELECT grid_id, grid_x, grid_y, forecast_url, forecast_hourly_url, "
+            "stations_url, fetched_at FROM gridpoints WHERE location = ?",
+            (self.location_key(latitude, longitude),)
+        ).fetchone()
+        if row is None or time.time() - row[6] > self.max_age:
+            return None
+        return {
+            "gridId": row[0],
+            "gridX": row[1],
+            "gridY": row[2],
+            "forecast": row[3],
+            "forecastHourly": row[4],
+            "observationStations": row[5]
+        }
+
+    def put(self, latitude: float, longitude: float, properties: dict[str, Any]) -> dict[str, Any]:
+        """Store the relevant fields of a /points response and return them."""
+        gridpoint = {
+            "gridId": properties.get("gridId"),
+            "gridX": properties.get("gridX"),
+            "gridY": properties.get("gridY"),
+            "forecast": properties["forecast"],
+            "forecastHourly": properties.get("forecastHourly"),
+            "observationStations": properties.get("observationStations")
+        }
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO gridpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.location_key(latitude, longitude),
+                gridpoint["gridId"],
+                gridpoint["gridX"],
+                gridpoint["gridY"],
+                gridpoint["forecast"],
+                gridpoint["forecastHourly"],
+                gridpoint["observationStations"],
+                time.time()
+            )
+        )
+        conn.commit()
+        return gridpoint
+
+    def invalidate(self, latitude: float | None = None, longitude: float | None = None) -> int:
+        """Drop one location, or every entry when no coordinates are given.
+
+        Returns the number of entries removed.
+        """
+        conn = self._connect()
+        if latitude is None or longitude is None:
+            cursor = conn.execute("DELETE FROM gridpoints")
+        else:
+            cursor = conn.execute(
+                "DELETE FROM gridpoints WHERE location = ?",
+                (self.location_key(latitude, longitude),)
+            )
+        conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+points_cache = GridpointCache(POINTS_CACHE_PATH, POINTS_CACHE_MAX_AGE)
+
+def _http_date(value: str | None) -> float | None:
+    """Parse an HTTP date header into a timestamp."""
+    if not value:
+        return None
+    try:
+        from email.utils import parsedate_to_datetime
+
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def freshness_lifetime(headers: Mapping[str, str]) -> float | None:
+    """Seconds a response may be served without revalidation.
+
+    Returns None when the response must not be stored at all.
+    """
+    directives = {}
+    for directive in headers.get("Cache-Control", "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name] = value.strip('"')
+
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+
+    lifetime = 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            lifetime = float(directives[name])
+            break
+    else:
+        expires = _http_date(headers.get("Expires"))
+        if expires is not None:
+            date = _http_date(headers.get("Date")) or time.time()
+            lifetime = max(0.0, expires - date)
+
+    age = headers.get("Age", "")
+    if age.isdigit():
+        lifetime = max(0.0, lifetime - float(age))
+    return lifetime
+
+@dataclass(slots=True)
+class CachedResponse:
+    data: dict[str, Any]
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Validators to send when revalidating a stale entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """LRU cache of NWS responses that follows HTTP caching headers.
+
+    Fresh entries are served from memory; stale entries that carry an ETag or
+    Last-Modified are revalidated with a conditional GET, so an unchanged
+    forecast costs a 304 instead of a full payload.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stale_served = 0
+
+    def get(self, url: str) -> CachedResponse | None:
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def store(self, url: str, data: dict[str, Any], headers: Mapping[str, str]) -> None:
+        lifetime = freshness_lifetime(headers)
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        # Nothing to gain from keeping a response we can neither reuse nor revalidate
+        if lifetime is None or (lifetime == 0 and not etag and not last_modified):
+            self._entries.pop(url, None)
+            return
+
+        self._entries[url] = CachedResponse(
+            data=data,
+            expires_at=time.monotonic() + lifetime,
+            etag=etag,
+            last_modified=last_modified
+        )
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def refresh(self, entry: CachedResponse, headers: Mapping[str, str]) -> None:
+        """Extend a stale entry's lifetime after a 304 Not Modified."""
+        entry.expires_at = time.monotonic() + (freshness_lifetime(headers) or 0.0)
+        entry.etag = headers.get("ETag", entry.etag)
+        entry.last_modified = headers.get("Last-Modified", entry.last_modified)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "stale_served": self.stale_served
+        }
+
+response_cache = ResponseCache(NWS_CACHE_MAX_ENTRIES)
+
+# Alert properties we render; everything else is dropped while streaming
+ALERT_FIELDS = ("event", "areaDesc", "severity", "description", "instruction", "geocode")
+
+_json_decoder = json.JSONDecoder()
+
+class FeatureStreamParser:
+    """Incremental parser for the "features" array of a GeoJSON collection.
+
+    Text is pushed in with ``feed`` and each feature is returned as soon as
+    its closing brace arrives, so only one feature (plus a partial chunk) is
+    held in memory regardless of the size of the payload. Other top-level
+    members are decoded and discarded.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._state = "start"
+        self._key: str | None = None
+        self.saw_features = False
+
+    def _decode(self, buffer: str, pos: int, final: bool) -> tuple[Any, int] | None:
+        """Decode one JSON value at ``pos``, or None if it is not complete yet."""
         try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception:
+            value, end = _json_decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # A number at the very end of the buffer may still be cut short
+        if end >= len(buffer) and not final:
             return None
+        return value, end
+
+    def feed(self, text: str, final: bool = False) -> list[dict[str, Any]]:
+        """Consume more text and return the features completed by it."""
+        buffer = self._buffer + text
+        pos = 0
+        features = []
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos >= len(buffer) or self._state == "end":
+                break
+            char = buffer[pos]
+
+            if self._state == "start":
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                self._state = "key"
+                pos += 1
+            elif self._state == "key":
+                if char == "}":
+                    self._state = "end"
+                    pos += 1
+                elif char == ",":
+                    pos += 1
+                else:
+                    decoded = self._decode(buffer, pos, final)
+                    if decoded is None:
+                        break
+                    self._key, pos = decoded
+                    self._state = "colon"
+            elif self._state == "colon":
+                if char != ":":
+                    raise ValueError("Expected ':' after object key")
+                self._state = "features" if self._key == "features" else "value"
+                pos += 1
+            elif self._state == "value":
+                decoded = self._decode(buffer, pos, final)
+                if decoded is None:
+                    break
+                pos = decoded[1]
+                self._state = "key"
+            elif self._state == "features":
+                if char != "[":
+                    raise ValueError("Expected 'features' to be an array")
+                self.saw_features = True
+                self._state = "feature"
+                pos += 1
+            elif self._state == "feature":
+                if char == "]":
+                    self._state = "key"
+                    pos += 1
+                elif char == ",":
+                    pos += 1
+                else:
+                    decoded = self._decode(buffer, pos, final)
+                    if decoded is None:
+                        break
+                    feature, pos = decoded
+                    features.append(feature)
+
+        self._buffer = buffer[pos:]
+        if final and self._state != "end":
+            raise ValueError("Truncated GeoJSON payload")
+        return features
+
+def slim_feature(feature: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """Keep only the given properties of a GeoJSON feature."""
+    props = feature.get("properties", {})
+    return {"properties": {name: props[name] for name in fields if name in props}}
+
+async def read_features(response: httpx.Response, fields: tuple[str, ...]) -> dict[str, Any]:
+    """Stream a GeoJSON response, keeping only ``fields`` of each feature."""
+    parser = FeatureStreamParser()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    features = []
+    async for chunk in response.aiter_bytes():
+        for feature in parser.feed(decoder.decode(chunk)):
+            features.append(slim_feature(feature, fields))
+    for feature in parser.feed(decoder.decode(b"", final=True), final=True):
+        features.append(slim_feature(feature, fields))
+
+    if not parser.saw_features:
+        return {}
+    return {"features": features}
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Own the shared NWS client and background jobs while the server runs.
+
+    The SDK enters this once per MCP session. Over stdio that is the whole
+    process; over streamable HTTP ``create_http_app`` holds one extra
+    reference for the life of the process, so sessions coming and going never
+    start or stop anything.
+    """
+    global _lifespan_users
+    _lifespan_users += 1
+    get_http_client()
+    if _lifespan_users == 1 and ALERTS_SNAPSHOT_ENABLED:
+        _background_tasks.append(asyncio.create_task(refresh_alerts_snapshot()))
+    if _lifespan_users == 1 and WARM_CACHE_ENABLED:
+        _background_tasks.append(asyncio.create_task(cache_warmer.run()))
+    try:
+        yield
+    finally:
+        _lifespan_users -= 1
+        if _lifespan_users == 0:
+            for task in _background_tasks:
+                task.cancel()
+            await asyncio.gather(*_background_tasks, return_exceptions=True)
+            _background_tasks.clear()
+            await close_http_client()
+            points_cache.close()
+
+# Initialize FastMCP server
+mcp = FastMCP("weather", lifespan=lifespan, host=MCP_HTTP_HOST, port=MCP_HTTP_PORT)
+
+class LatencyTracker:
+    """Rolling window of NWS response times used to pick the hedge delay."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self._samples: deque[float] = deque(maxlen=size)
+        self._min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def hedge_delay(self) -> float:
+        """Configured percentile of recent latencies, or NWS_HEDGE_DELAY until warmed up."""
+        if len(self._samples) < self._min_samples:
+            return NWS_HEDGE_DELAY
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * NWS_HEDGE_PERCENTILE / 100))
+        return ordered[index]
+
+class RetryBudget:
+    """Token bucket limiting retries and hedges to a fraction of requests.
+
+    Every upstream request deposits ``ratio`` tokens and every extra attempt
+    withdraws one, so a struggling NWS sees at most ~``ratio`` more load
+    instead of a retry storm.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+def endpoint_class(url: str) -> str:
+    """Group NWS URLs with comparable latencies, e.g. "points" or "gridpoints/forecast"."""
+    parts = httpx.URL(url).path.strip("/").split("/")
+    if parts[0] == "gridpoints":
+        return f"gridpoints/{parts[-1]}"
+    return parts[0]
+
+# One latency window per endpoint class, so a slow endpoint doesn't set the hedge delay of a fast one
+nws_latency: dict[str, LatencyTracker] = {}
+
+def latency_tracker(url: str) -> LatencyTracker:
+    return nws_latency.setdefault(endpoint_class(url), LatencyTracker())
+
+retry_budget = RetryBudget(NWS_RETRY_BUDGET_RATIO, NWS_RETRY_BUDGET_MAX)
+
+# Absolute (monotonic) deadline of the tool call currently being served
+_call_deadline: ContextVar[float | None] = ContextVar("nws_call_deadline", default=None)
+
+@contextmanager
+def call_deadline(seconds: float) -> Iterator[None]:
+    """Share one time budget across every NWS fetch made inside the block.
+
+    Nested blocks keep the outer, tighter-scoped deadline.
+    """
+    if _call_deadline.get() is not None:
+        yield
+        return
+    token = _call_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _call_deadline.reset(token)
+
+def time_left() -> float | None:
+    """Seconds left before the current call's deadline, or None if unbounded."""
+    deadline = _call_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def _is_transient(error: BaseException) -> bool:
+    """Whether a failed attempt is worth retrying."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+# Fetches currently on the wire, so concurrent callers for a URL share one
+_inflight_requests: dict[str, asyncio.Task] = {}
+fetch_stats = {
+    "coalesced": 0,
+    "retries": 0,
+    "retry_budget_exhausted": 0,
+    "hedges_fired": 0,
+    "hedges_won": 0,
+    "deadline_exceeded": 0
+}
+
+class UpstreamGone(Exception):
+    """NWS answered 404/410: the URL itself no longer exists."""
+
+async def make_nws_request(
+    url: str,
+    feature_fields: tuple[str, ...] | None = None,
+    force_refresh: bool = False,
+    raise_gone: bool = False
+) -> dict[str, Any] | None:
+    """Make a request to the NWS API with proper error handling.
+
+    Responses are served from the in-memory cache while fresh and
+    revalidated with a conditional GET once stale. Concurrent calls for the
+    same URL are coalesced into a single upstream fetch.
+
+    When ``feature_fields`` is given the body is parsed as a stream of
+    GeoJSON features and only those properties are kept, which bounds
+    memory for multi-megabyte alert payloads.
+
+    ``force_refresh`` revalidates even a fresh entry, so background jobs can
+    renew it before it expires.
+
+    Inside ``call_deadline`` the wait never exceeds the call's remaining
+    budget; on timeout a stale entry is returned if there is one.
+
+    Raises:
+        UpstreamGone: if ``raise_gone`` is set and NWS answered 404 or 410
+    """
+    key = url if feature_fields is None else f"{url}#{','.join(feature_fields)}"
+    entry = response_cache.get(key)
+    if entry is not None and entry.is_fresh() and not force_refresh:
+        response_cache.hits += 1
+        return entry.data
+
+    remaining = time_left()
+    if remaining is not None and remaining <= 0:
+        fetch_stats["deadline_exceeded"] += 1
+        return entry.data if entry is not None else None
+
+    task = _inflight_requests.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_nws(url, key, entry, feature_fields))
+        _inflight_requests[key] = task
+        task.add_done_callback(lambda done: _forget_inflight(key, done))
+    else:
+        fetch_stats["coalesced"] += 1
+
+    # Shield the shared fetch so one cancelled caller doesn't cancel it for the rest
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), remaining)
+    except asyncio.TimeoutError:
+        fetch_stats["deadline_exceeded"] += 1
+        return entry.data if entry is not None else None
+    except UpstreamGone:
+        if raise_gone:
+            raise
+        return entry.data if entry is not None else None
+
+def _forget_inflight(key: str, task: asyncio.Task) -> None:
+    if _inflight_requests.get(key) is task:
+        del _inflight_requests[key]
+    # Mark an UpstreamGone as retrieved even if every caller already timed out
+    if not task.cancelled():
+        task.exception()
+
+async def _fetch_nws(
+    url: str,
+    key: str,
+    entry: CachedResponse | None,
+    feature_fields: tuple[str, ...] | None
+) -> dict[str, Any] | None:
+    """Fetch a URL from NWS, revalidating ``entry`` when one is cached."""
+    try:
+        headers = entry.conditional_headers() if entry is not None else {}
+        status, response_headers, data = await _fetch_with_retries(url, headers, feature_fields)
+        if status == 304:
+            if entry is None:
+                return None
+            response_cache.revalidations += 1
+            response_cache.refresh(entry, response_headers)
+            return entry.data
+
+        response_cache.misses += 1
+        response_cache.store(key, data, response_headers)
+        return data
+    except Exception as e:
+        if isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (404, 410):
+            raise UpstreamGone(url) from e
+        # Better a slightly stale forecast than none at all
+        if entry is not None:
+            response_cache.stale_served += 1
+            return entry.data
+        return None
+
+async def _fetch_with_retries(
+    url: str,
+    headers: dict[str, str],
+    feature_fields: tuple[str, ...] | None
+) -> tuple[int, httpx.Headers, Any]:
+    """Hedged fetch with bounded, jittered retries for transient failures."""
+    retry_budget.deposit()
+    attempt = 0
+    while True:
+        try:
+            return await _hedged_fetch(url, headers, feature_fields)
+        except Exception as e:
+            if not _is_transient(e) or attempt >= NWS_MAX_RETRIES:
+                raise
+            # Full jitter keeps retries from many callers from lining up
+            backoff = random.uniform(0, NWS_RETRY_BACKOFF * 2 ** attempt)
+            remaining = time_left()
+            if remaining is not None and remaining <= backoff:
+                raise
+            if not retry_budget.withdraw():
+                fetch_stats["retry_budget_exhausted"] += 1
+                raise
+            fetch_stats["retries"] += 1
+            attempt += 1
+            await asyncio.sleep(backoff)
+
+async def _hedged_fetch(
+    url: str,
+    headers: dict[str, str],
+    feature_fields: tuple[str, ...] | None
+) -> tuple[int, httpx.Headers, Any]:
+    """Fetch once, firing a duplicate request if the first one is slow.
+
+    The hedge goes out after the recent p95 latency of the endpoint and is
+    paid for from the retry budget; whichever attempt succeeds first wins and
+    the other is cancelled. Streamed (``feature_fields``) downloads are never
+    hedged, since duplicating a multi-megabyte transfer costs more than it saves.
+    """
+    timeout = NWS_TIMEOUT
+    remaining = time_left()
+    if remaining is not None:
+        timeout = min(timeout, remaining)
+
+    primary = asyncio.create_task(_fetch_once(url, headers, feature_fields, timeout))
+    pending = {primary}
+    hedge = None
+    try:
+        if NWS_HEDGE_ENABLED and feature_fields is None:
+            hedge_delay = latency_tracker(url).hedge_delay()
+            done, _ = await asyncio.wait(pending, timeout=min(hedge_delay, timeout))
+            if not done and retry_budget.withdraw():
+                fetch_stats["hedges_fired"] += 1
+                hedge = asyncio.create_task(_fetch_once(url, headers, feature_fields, timeout))
+                pending.add(hedge)
+
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        fetch_stats["hedges_won"] += 1
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def _fetch_once(
+    url: str,
+    headers: dict[str, str],
+    feature_fields: tuple[str, ...] | None,
+    timeout: float
+) -> tuple[int, httpx.Headers, Any]:
+    """A single GET, bounded as a whole (body included) by ``timeout``."""
+    return await asyncio.wait_for(_get(url, headers, feature_fields, timeout), timeout)
+
+async def _get(
+    url: str,
+    headers: dict[str, str],
+    feature_fields: tuple[str, ...] | None,
+    timeout: float
+) -> tuple[int, httpx.Headers, Any]:
+    started = time.monotonic()
+    client = get_http_client()
+    async with client.stream("GET", url, headers=headers, timeout=timeout) as response:
+        if response.status_code == 304:
+            data = None
+        else:
+            response.raise_for_status()
+            if feature_fields is None:
+                data = json.loads(await response.aread())
+            else:
+                data = await read_features(response, feature_fields)
+    if feature_fields is None:
+        # Streamed payloads measure transfer size more than server latency
+        latency_tracker(url).record(time.monotonic() - started)
+    return response.status_code, response.headers, data
+
+async def fetch_gridpoint(latitude: float, longitude: float) -> dict[str, Any] | None:
+    """Look up a location's NWS gridpoint and store it in the persistent cache."""
+    points_url = f"{NWS_API_BASE}/points/{GridpointCache.location_key(latitude, longitude)}"
+    points_data = await make_nws_request(points_url)
+    if not points_data or "forecast" not in points_data.get("properties", {}):
+        return None
+
+    return points_cache.put(latitude, longitude, points_data["properties"])
 
 def fahrenheit_to_celsius(fahrenheit: int) -> int:
     """Convert Fahrenheit to Celsius."""
@@ -32,75 +794,524 @@ def format_temperature(temp_f: int) -> str:
     temp_c = fahrenheit_to_celsius(temp_f)
     return f"{temp_f}°F ({temp_c}°C)"
 
+class Alert:
+    """Compact view of an NWS alert holding only the fields we render."""
+
+    __slots__ = ("event", "area", "severity", "description", "instruction", "zones", "_text")
+
+    def __init__(self, event: str, area: str, severity: str, description: str,
+                 instruction: str, zones: list[str]):
+        self.event = event
+        self.area = area
+        self.severity = severity
+        self.description = description
+        self.instruction = instruction
+        self.zones = zones
+        self._text: str | None = None
+
+    @classmethod
+    def from_feature(cls, feature: dict) -> "Alert":
+        props = feature["properties"]
+        return cls(
+            event=props.get('event', 'Unknown'),
+            area=props.get('areaDesc', 'Unknown'),
+            severity=props.get('severity', 'Unknown'),
+            description=props.get('description', 'No description available'),
+            instruction=props.get('instruction', 'No specific instructions provided'),
+            # UGC zone and county codes (e.g. NYZ075, NYC047) the alert applies to
+            zones=props.get('geocode', {}).get('UGC', [])
+        )
+
+    def render(self) -> str:
+        """Readable text for the alert, built once and reused."""
+        if self._text is None:
+            self._text = f"""
+Event: {self.event}
+Area: {self.area}
+Severity: {self.severity}
+Description: {self.description}
+Instructions: {self.instruction}
+"""
+        return self._text
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "event": self.event,
+            "area": self.area,
+            "severity": self.severity,
+            "description": self.description,
+            "instruction": self.instruction
+        }
+
 def format_alert(feature: dict) -> str:
     """Format an alert feature into a readable string."""
-    props = feature["properties"]
-    return f"""
-Event: {props.get('event', 'Unknown')}
-Area: {props.get('areaDesc', 'Unknown')}
-Severity: {props.get('severity', 'Unknown')}
-Description: {props.get('description', 'No description available')}
-Instructions: {props.get('instruction', 'No specific instructions provided')}
+    return Alert.from_feature(feature).render()
+
+class ForecastPeriod:
+    """Compact view of one NWS forecast period holding only the fields we use."""
+
+    __slots__ = ("name", "start_time", "is_daytime", "temperature", "wind_speed",
+                 "wind_direction", "short_forecast", "detailed_forecast", "precipitation")
+
+    def __init__(self, period: dict[str, Any]):
+        self.name = period['name']
+        self.start_time = period.get('startTime')
+        self.is_daytime = period.get('isDaytime')
+        self.temperature = period['temperature']
+        self.wind_speed = period['windSpeed']
+        self.wind_direction = period['windDirection']
+        self.short_forecast = period.get('shortForecast')
+        self.detailed_forecast = period['detailedForecast']
+        self.precipitation = (period.get('probabilityOfPrecipitation') or {}).get('value')
+
+    def render(self) -> str:
+        # Format temperature with both F and C
+        return f"""
+{self.name}:
+Temperature: {format_temperature(self.temperature)}
+Wind: {self.wind_speed} {self.wind_direction}
+Forecast: {self.detailed_forecast}
 """
 
+    def to_dict(self) -> dict[str, Any]:
+        data = {
+            "name": self.name,
+            "startTime": self.start_time,
+            "isDaytime": self.is_daytime,
+            "temperatureF": self.temperature,
+            "temperatureC": fahrenheit_to_celsius(self.temperature),
+            "windSpeed": self.wind_speed,
+            "windDirection": self.wind_direction,
+            "shortForecast": self.short_forecast,
+            "detailedForecast": self.detailed_forecast,
+            "precipitationChance": self.precipitation
+        }
+        return {key: value for key, value in data.items() if value is not None}
+
+class WeatherDataUnavailable(Exception):
+    """NWS data could not be fetched; the message is meant for the user."""
+
+def tool_result(text: str, structured: dict[str, Any]) -> CallToolResult:
+    """Return readable text together with MCP structured content."""
+    return CallToolResult(
+        content=[TextContent(type="text", text=text)],
+        structuredContent=structured
+    )
+
+class AlertsSnapshot:
+    """In-memory index over the national /alerts/active feed.
+
+    Alerts are parsed once when the snapshot is loaded and indexed by
+    state, UGC zone/county code and severity, so lookups are dictionary hits.
+    """
+
+    def __init__(self):
+        self.loaded_at: float | None = None
+        self.by_state: dict[str, list[Alert]] = {}
+        self.by_zone: dict[str, list[Alert]] = {}
+        self.by_severity: dict[str, list[Alert]] = {}
+        self._source: dict[str, Any] | None = None
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.loaded_at = time.monotonic()
+        # make_nws_request hands back the same object while the cache is fresh
+        if data is self._source:
+            return
+
+        by_state: dict[str, list[Alert]] = {}
+        by_zone: dict[str, list[Alert]] = {}
+        by_severity: dict[str, list[Alert]] = {}
+        for feature in data["features"]:
+            alert = Alert.from_feature(feature)
+            for state in {zone[:2] for zone in alert.zones}:
+                by_state.setdefault(state, []).append(alert)
+            for zone in alert.zones:
+                by_zone.setdefault(zone, []).append(alert)
+            by_severity.setdefault(alert.severity or "Unknown", []).append(alert)
+
+        # Swap whole indexes so readers never see a half-built snapshot
+        self.by_state, self.by_zone, self.by_severity = by_state, by_zone, by_severity
+        self._source = data
+
+    def age(self) -> float | None:
+        """Seconds since the snapshot was last refreshed."""
+        if self.loaded_at is None:
+            return None
+        return time.monotonic() - self.loaded_at
+
+    def is_usable(self) -> bool:
+        age = self.age()
+        return age is not None and age <= ALERTS_SNAPSHOT_MAX_AGE
+
+    def stats(self) -> dict[str, Any]:
+        age = self.age()
+        return {
+            "enabled": ALERTS_SNAPSHOT_ENABLED,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "states": len(self.by_state),
+            "by_severity": {severity: len(alerts) for severity, alerts in self.by_severity.items()}
+        }
+
+alerts_snapshot = AlertsSnapshot()
+
+async def refresh_alerts_snapshot() -> None:
+    """Periodically pull the national alerts feed into ``alerts_snapshot``."""
+    while True:
+        data = await make_nws_request(f"{NWS_API_BASE}/alerts/active", ALERT_FIELDS)
+        if data and "features" in data:
+            try:
+                alerts_snapshot.load(data)
+            except Exception:
+                pass  # Keep serving the previous snapshot until the next refresh
+        await asyncio.sleep(ALERTS_REFRESH_INTERVAL)
+
 @mcp.tool()
-async def get_alerts(state: str) -> str:
+async def get_alerts(state: str) -> CallToolResult:
     """Get weather alerts for a US state.
 
     Args:
         state: Two-letter US state code (e.g. CA, NY)
     """
+    with call_deadline(NWS_CALL_DEADLINE):
+        return await _get_alerts(state)
+
+async def _get_alerts(state: str) -> CallToolResult:
+    if ALERTS_SNAPSHOT_ENABLED and alerts_snapshot.is_usable():
+        alerts = alerts_snapshot.by_state.get(state.upper(), [])
+        age = alerts_snapshot.age()
+        age_note = f"\n(Alerts snapshot age: {age:.0f}s)"
+        structured = {
+            "alerts": [alert.to_dict() for alert in alerts],
+            "snapshotAgeSeconds": round(age)
+        }
+        if not alerts:
+            return tool_result("No active alerts for this state." + age_note, structured)
+        return tool_result("\n---\n".join(alert.render() for alert in alerts) + age_note, structured)
+
     url = f"{NWS_API_BASE}/alerts/active/area/{state}"
-    data = await make_nws_request(url)
+    data = await make_nws_request(url, ALERT_FIELDS)
 
     if not data or "features" not in data:
-        return "Unable to fetch alerts or no alerts found."
+        message = "Unable to fetch alerts or no alerts found."
+        return tool_result(message, {"error": message})
 
     if not data["features"]:
-        return "No active alerts for this state."
+        return tool_result("No active alerts for this state.", {"alerts": []})
+
+    alerts = [Alert.from_feature(feature) for feature in data["features"]]
+    return tool_result(
+        "\n---\n".join(alert.render() for alert in alerts),
+        {"alerts": [alert.to_dict() for alert in alerts]}
+    )
+
+def has_periods(forecast_data: dict[str, Any] | None) -> bool:
+    """Whether a forecast payload carries a usable list of periods."""
+    if not isinstance(forecast_data, dict):
+        return False
+    return isinstance(forecast_data.get("properties", {}).get("periods"), list)
+
+async def load_forecast(
+    latitude: float,
+    longitude: float,
+    force_refresh: bool = False
+) -> list[ForecastPeriod]:
+    """Fetch the forecast periods for a location.
+
+    Raises:
+        WeatherDataUnavailable: if NWS could not be reached for this location
+    """
+    # First get the forecast grid endpoint, skipping /points when cached
+    gridpoint = points_cache.get(latitude, longitude)
+    from_cache = gridpoint is not None
+    if not from_cache:
+        gridpoint = await fetch_gridpoint(latitude, longitude)
+
+    if not gridpoint:
+        raise WeatherDataUnavailable("Unable to fetch forecast data for this location.")
+
+    try:
+        forecast_data = await make_nws_request(
+            gridpoint["forecast"], force_refresh=force_refresh, raise_gone=True
+        )
+        stale_gridpoint = forecast_data is not None and not has_periods(forecast_data)
+    except UpstreamGone:
+        forecast_data, stale_gridpoint = None, True
+
+    if stale_gridpoint and from_cache:
+        # The stored forecast URL is gone or broken (NWS occasionally re-grids
+        # an office), so drop it and retry once with a fresh /points lookup.
+        # Outages and timeouts leave the entry alone.
+        points_cache.invalidate(latitude, longitude)
+        gridpoint = await fetch_gridpoint(latitude, longitude)
+        if gridpoint:
+            forecast_data = await make_nws_request(gridpoint["forecast"])
+
+    if not has_periods(forecast_data):
+        raise WeatherDataUnavailable("Unable to fetch detailed forecast.")
+
+    return [ForecastPeriod(period) for period in forecast_data["properties"]["periods"]]
 
-    alerts = [format_alert(feature) for feature in data["features"]]
-    return "\n---\n".join(alerts)
+def render_forecast(periods: list[ForecastPeriod]) -> str:
+    """Format forecast periods into a readable forecast."""
+    return "\n---\n".join(period.render() for period in periods)
 
 @mcp.tool()
-async def get_forecast(latitude: float, longitude: float) -> str:
+async def get_forecast(latitude: float, longitude: float, periods: int = 5) -> CallToolResult:
     """Get weather forecast for a location.
 
     Args:
         latitude: Latitude of the location
         longitude: Longitude of the location
+        periods: Number of forecast periods to return (12-hour periods, default 5)
     """
-    # First get the forecast grid endpoint
-    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    points_data = await make_nws_request(points_url)
+    try:
+        with call_deadline(NWS_CALL_DEADLINE):
+            forecast = await load_forecast(latitude, longitude)
+    except WeatherDataUnavailable as e:
+        return tool_result(str(e), {"error": str(e)})
 
-    if not points_data:
-        return "Unable to fetch forecast data for this location."
+    selected = forecast[:max(1, periods)]
+    return tool_result(
+        render_forecast(selected),
+        {"periods": [period.to_dict() for period in selected]}
+    )
 
-    # Get the forecast URL from the points response
-    forecast_url = points_data["properties"]["forecast"]
-    forecast_data = await make_nws_request(forecast_url)
+# Cities the clients know about; the warmer keeps their forecasts cached
+SUPPORTED_CITIES = {
+    'New York': (40.7128, -74.0060),
+    'Los Angeles': (34.0522, -118.2437),
+    'Chicago': (41.8781, -87.6298),
+    'Houston': (29.7604, -95.3698),
+    'Phoenix': (33.4484, -112.0740),
+    'Philadelphia': (39.9526, -75.1652),
+    'San Antonio': (29.4241, -98.4936),
+    'San Diego': (32.7157, -117.1611),
+    'Dallas': (32.7767, -96.7970),
+    'San Jose': (37.3382, -121.8863),
+    'Austin': (30.2672, -97.7431),
+    'Jacksonville': (30.3322, -81.6557),
+    'San Francisco': (37.7749, -122.4194),
+    'Columbus': (39.9612, -82.9988),
+    'Charlotte': (35.2271, -80.8431),
+    'Fort Worth': (32.7555, -97.3308),
+    'Detroit': (42.3314, -83.0458),
+    'El Paso': (31.7619, -106.4850),
+    'Memphis': (35.1495, -90.0490),
+    'Seattle': (47.6062, -122.3321),
+    'Denver': (39.7392, -104.9903),
+    'Washington': (38.9072, -77.0369),
+    'Boston': (42.3601, -71.0589),
+    'Nashville': (36.1627, -86.7816),
+    'Baltimore': (39.2904, -76.6122),
+    'Oklahoma City': (35.4676, -97.5164),
+    'Portland': (45.5152, -122.6784),
+    'Las Vegas': (36.1699, -115.1398),
+    'Milwaukee': (43.0389, -87.9065),
+    'Albuquerque': (35.0844, -106.6504),
+    'Tucson': (32.2226, -110.9747),
+    'Fresno': (36.7378, -119.7871),
+    'Sacramento': (38.5816, -121.4944),
+    'Miami': (25.7617, -80.1918),
+    'Kansas City': (39.0997, -94.5786),
+    'Mesa': (33.4152, -111.8315),
+    'Atlanta': (33.7490, -84.3880),
+    'Omaha': (41.2565, -95.9345),
+    'Raleigh': (35.7796, -78.6382),
+    'Colorado Springs': (38.8339, -104.8214),
+    'Virginia Beach': (36.8529, -76.0927)
+}
 
-    if not forecast_data:
-        return "Unable to fetch detailed forecast."
+def load_warm_cities() -> dict[str, tuple[float, float]]:
+    """Cities to keep warm: NWS_WARM_CITIES if set, otherwise SUPPORTED_CITIES."""
+    if not WARM_CITIES_FILE:
+        return SUPPORTED_CITIES
+    with open(WARM_CITIES_FILE) as f:
+        cities = json.load(f)
+    return {name: (coords["latitude"], coords["longitude"]) for name, coords in cities.items()}
 
-    # Format the periods into a readable forecast
-    periods = forecast_data["properties"]["periods"]
-    forecasts = []
-    for period in periods[:5]:  # Only show next 5 periods
-        # Format temperature with both F and C
-        temp_formatted = format_temperature(period['temperature'])
-        
-        forecast = f"""
-{period['name']}:
-Temperature: {temp_formatted}
-Wind: {period['windSpeed']} {period['windDirection']}
-Forecast: {period['detailedForecast']}
-"""
-        forecasts.append(forecast)
+class CacheWarmer:
+    """Keeps forecasts for a fixed city list in the response cache.
+
+    Cities are warmed one at a time, ``WARM_SPACING`` seconds apart, to stay
+    well inside NWS rate limits. Each city is refreshed shortly before its
+    cached forecast expires, so user requests keep hitting a fresh entry.
+    """
+
+    def __init__(self, cities: dict[str, tuple[float, float]]):
+        self.cities = cities
+        self._next_due = {name: 0.0 for name in cities}
+        self.last_error: dict[str, str] = {}
+
+    def _forecast_entry(self, latitude: float, longitude: float) -> CachedResponse | None:
+        gridpoint = points_cache.get(latitude, longitude)
+        if gridpoint is None:
+            return None
+        return response_cache.get(gridpoint["forecast"])
+
+    async def warm(self, name: str) -> None:
+        latitude, longitude = self.cities[name]
+        try:
+            await load_forecast(latitude, longitude, force_refresh=True)
+        except Exception as e:
+            self.last_error[name] = str(e)
+            self._next_due[name] = time.monotonic() + WARM_RETRY_INTERVAL
+            return
+
+        self.last_error.pop(name, None)
+        entry = self._forecast_entry(latitude, longitude)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._next_due[name] = entry.expires_at - WARM_REFRESH_MARGIN
+        else:
+            self._next_due[name] = time.monotonic() + WARM_FALLBACK_INTERVAL
+
+    async def run(self) -> None:
+        while True:
+            for name in self.cities:
+                if self._next_due[name] <= time.monotonic():
+                    await self.warm(name)
+                    await asyncio.sleep(WARM_SPACING)
+            next_due = min(self._next_due.values(), default=time.monotonic() + WARM_FALLBACK_INTERVAL)
+            await asyncio.sleep(max(WARM_SPACING, next_due - time.monotonic()))
 
-    return "\n---\n".join(forecasts)
+    def status(self) -> dict[str, str]:
+        """Per-city "warm", "cold" or "error" status."""
+        statuses = {}
+        for name, (latitude, longitude) in self.cities.items():
+            entry = self._forecast_entry(latitude, longitude)
+            if entry is not None and entry.is_fresh():
+                statuses[name] = "warm"
+            elif name in self.last_error:
+                statuses[name] = "error"
+            else:
+                statuses[name] = "cold"
+        return statuses
+
+    def stats(self) -> dict[str, Any]:
+        statuses = list(self.status().values())
+        return {
+            "enabled": WARM_CACHE_ENABLED,
+            "cities": len(self.cities),
+            "warm": statuses.count("warm"),
+            "cold": statuses.count("cold"),
+            "error": statuses.count("error")
+        }
+
+cache_warmer = CacheWarmer(load_warm_cities() if WARM_CACHE_ENABLED else {})
+
+class Location(BaseModel):
+    latitude: float = Field(description="Latitude of the location")
+    longitude: float = Field(description="Longitude of the location")
+
+@mcp.tool()
+async def get_forecasts(locations: list[Location], periods: int = 5) -> CallToolResult:
+    """Get weather forecasts for several locations at once.
+
+    Args:
+        locations: List of locations, each with a latitude and longitude
+        periods: Number of forecast periods to return per location (default 5)
+    """
+    if not locations:
+        return tool_result("No locations provided.", {"locations": []})
+    if len(locations) > BULK_FORECAST_MAX_LOCATIONS:
+        message = f"Too many locations: at most {BULK_FORECAST_MAX_LOCATIONS} per request."
+        return tool_result(message, {"error": message})
+
+    semaphore = asyncio.Semaphore(BULK_FORECAST_CONCURRENCY)
+
+    async def forecast_for(location: Location) -> list[ForecastPeriod] | str:
+        async with semaphore:
+            try:
+                # Each location gets its own budget, started once it holds a slot,
+                # so slow early items can't use up the time of later ones
+                with call_deadline(NWS_CALL_DEADLINE):
+                    forecast = await load_forecast(location.latitude, location.longitude)
+                return forecast[:max(1, periods)]
+            except Exception as e:
+                return str(e)
+
+    # gather keeps results in input order regardless of completion order
+    results = await asyncio.gather(*(forecast_for(location) for location in locations))
+
+    sections = []
+    structured = []
+    for index, (location, result) in enumerate(zip(locations, results), start=1):
+        item = {"latitude": location.latitude, "longitude": location.longitude}
+        if isinstance(result, str):
+            text = f"Error: {result}"
+            item["error"] = result
+        else:
+            text = render_forecast(result)
+            item["periods"] = [period.to_dict() for period in result]
+        sections.append(f"Location {index} ({location.latitude}, {location.longitude}):\n{text}")
+        structured.append(item)
+    return tool_result("\n===\n".join(sections), {"locations": structured})
+
+@mcp.resource("weather://alerts/zone/{zone}")
+def get_zone_alerts(zone: str) -> str:
+    """Active alerts for a UGC zone or county code, from the alerts snapshot."""
+    if not alerts_snapshot.is_usable():
+        return "Alerts snapshot is not available."
+    alerts = alerts_snapshot.by_zone.get(zone.upper(), [])
+    if not alerts:
+        return "No active alerts for this zone."
+    return "\n---\n".join(alert.render() for alert in alerts)
+
+@mcp.resource("weather://warmer")
+def get_warmer_status() -> str:
+    """Warm/cold status of every city the cache warmer tracks."""
+    return json.dumps(cache_warmer.status())
+
+@mcp.resource("weather://stats")
+def get_stats() -> str:
+    """Cache statistics for the weather server."""
+    return json.dumps({
+        "response_cache": response_cache.stats(),
+        "requests": {
+            "in_flight": len(_inflight_requests),
+            "hedge_delay_seconds": {
+                name: round(tracker.hedge_delay(), 3) for name, tracker in nws_latency.items()
+            },
+            "retry_budget_tokens": round(retry_budget.tokens, 2),
+            **fetch_stats
+        },
+        "alerts_snapshot": alerts_snapshot.stats(),
+        "cache_warmer": cache_warmer.stats()
+    })
+
+def create_http_app() -> "Starlette":
+    """Streamable HTTP app whose shared resources live as long as the process.
+
+    Also usable as a uvicorn factory: ``uvicorn weather:create_http_app --factory``.
+    """
+    app = mcp.streamable_http_app()
+
+    @asynccontextmanager
+    async def app_lifespan(app: "Starlette") -> AsyncIterator[None]:
+        # Warm caches and start the alerts snapshot before the first host connects
+        async with lifespan(mcp), mcp.session_manager.run():
+            yield
+
+    app.router.lifespan_context = app_lifespan
+    return app
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NWS weather MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http"],
+        default="stdio",
+        help="stdio when spawned by a host; streamable-http to run one shared server "
+             f"on http://{MCP_HTTP_HOST}:{MCP_HTTP_PORT}/mcp",
+    )
+    args = parser.parse_args()
+
     # Initialize and run the server
-    mcp.run(transport='stdio')
\ No newline at end of file
+    if args.transport == "streamable-http":
+        import uvicorn
+
+        uvicorn.run(create_http_app(), host=MCP_HTTP_HOST, port=MCP_HTTP_PORT,
+                    log_level=mcp.settings.log_level.lower())
+    else:
+        mcp.run(transport=args.transport)
\ No newline at end of file
@@ -5,10 +5,12 @@ Simple, fast, and embedded HTML interface
 """
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from dotenv import load_dotenv
 import asyncio
 from gemini_client import GeminiMCPClient
+from client import MCPClientPool
+import json
 import os
 
 # Load environment variables
@@ -19,13 +21,19 @@ app = FastAPI(title="🌤️ Gemini Weather Assistant", version="1.0.0")
 # Global client instance
 gemini_client = None
 
+# Number of weather server processes to run ("auto" = CPU count, unset = single process)
+MCP_POOL_SIZE = os.getenv('MCP_POOL_SIZE')
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize Gemini client on startup"""
     global gemini_client
     try:
         print("🚀 Starting Gemini Weather Assistant...")
-        gemini_client = GeminiMCPClient()
+        mcp_client = None
+        if MCP_POOL_SIZE:
+            mcp_client = MCPClientPool(None if MCP_POOL_SIZE == 'auto' else int(MCP_POOL_SIZE))
+        gemini_client = GeminiMCPClient(mcp_client=mcp_client)
         await gemini_client.connect()
         print("✅ Gemini client ready!")
     except Exception as e:
@@ -243,13 +251,70 @@ async def home():
             function addMessage(content, isUser = false) {
                 const messageDiv = document.createElement('div');
                 messageDiv.className = `message ${isUser ? 'user-message' : 'bot-message'}`;
+                chatContainer.appendChild(messageDiv);
+                renderMessage(messageDiv, content);
+                return messageDiv;
+            }
+            
+            function renderMessage(messageDiv, content) {
                 // Convert newlines to <br> tags
                 const formattedContent = content.split('\\n').join('<br>');
                 messageDiv.innerHTML = formattedContent;
-                chatContainer.appendChild(messageDiv);
                 chatContainer.scrollTop = chatContainer.scrollHeight;
             }
             
+            // Read Server-Sent Events from /chat/stream and grow one message as chunks arrive
+            async function streamReply(message) {
+                const response = await fetch('/chat/stream', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify({message: message})
+                });
+                if (!response.ok || !response.body) {
+                    throw new Error('Streaming not available: ' + response.status);
+                }
+                
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                let text = '';
+                let messageDiv = null;
+                
+                while (true) {
+                    const {value, done} = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, {stream: true});
+                    const events = buffer.split('\\n\\n');
+                    buffer = events.pop();
+                    
+                    for (const event of events) {
+                        const dataLine = event.split('\\n').find(line => line.startsWith('data: '));
+                        if (!dataLine) continue;
+                        const data = JSON.parse(dataLine.slice(6));
+                        if (data.error) {
+                            text += '❌ Sorry, something went wrong: ' + data.error;
+                        } else if (data.chunk) {
+                            text += data.chunk;
+                        } else {
+                            continue;
+                        }
+                        if (messageDiv) {
+                            renderMessage(messageDiv, text);
+                        } else {
+                            // First chunk: replace the "Thinking..." indicator with the answer
+                            loading.style.display = 'none';
+                            messageDiv = addMessage(text);
+                        }
+                    }
+                }
+                
+                if (!messageDiv) {
+                    addMessage('❌ Sorry, something went wrong: Empty response');
+                }
+            }
+            
             function setLoading(show) {
                 loading.style.display = show ? 'block' : 'none';
                 sendButton.disabled = show;
@@ -274,24 +339,8 @@ async def home():
                 setLoading(true);
                 
                 try {
-                    console.log('Sending request to /chat');
-                    const response = await fetch('/chat', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({message: message})
-                    });
-                    
-                    console.log('Response status:', response.status);
-                    const data = await response.json();
-                    console.log('Response data:', data);
-                    
-                    if (data.success) {
-                        addMessage(data.response);
-                    } else {
-                        addMessage('❌ Sorry, something went wrong: ' + (data.error || 'Unknown error'));
-                    }
+                    console.log('Sending request to /chat/stream');
+                    await streamReply(message);
                 } catch (error) {
                     console.error('Fetch error:', error);
                     addMessage('❌ Connection error. Please try again.');
@@ -360,6 +409,35 @@ async def chat(request: Request):
         traceback.print_exc()
         return {"success": False, "error": str(e)}
 
+@app.post("/chat/stream")
+async def chat_stream(request: Request):
+    """Handle chat requests, streaming the answer as Server-Sent Events"""
+    data = await request.json()
+    message = data.get("message", "").strip()
+    print(f"📥 Received streaming chat request: {message}")
+    
+    async def events():
+        if not message:
+            yield f"data: {json.dumps({'error': 'Empty message'})}\n\n"
+            return
+        if not gemini_client:
+            yield f"data: {json.dumps({'error': 'Weather service not initialized. Please wait and try again.'})}\n\n"
+            return
+        try:
+            async for chunk in gemini_client.chat_with_weather_stream(message):
+                yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+        except Exception as e:
+            print(f"❌ Chat stream error: {e}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        yield f"data: {json.dumps({'done': True})}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -369,7 +447,11 @@ async def health_check():
         "status": status, 
         "service": "Gemini Weather Assistant",
         "api_key": api_key_status,
-        "client_ready": gemini_client is not None
+        "client_ready": gemini_client is not None,
+        "mcp_pool": gemini_client.mcp_client.stats() if gemini_client and isinstance(gemini_client.mcp_client, MCPClientPool) else None,
+        "tool_cache": gemini_client.mcp_client.result_cache.stats() if gemini_client and gemini_client.mcp_client.result_cache else None,
+        "answer_cache": gemini_client.answer_cache.stats() if gemini_client else None,
+        "token_usage": gemini_client.token_usage if gemini_client else None
     }
 
 @app.post("/test")